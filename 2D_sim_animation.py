@@ -1,72 +1,42 @@
-import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.animation import FuncAnimation
-from scipy.interpolate import splprep, splev
-
-from simulation_base import (
-    plot_frame,
-    plot_side_axes,
-    plot_origin,
-    plot_point_P,
-    plot_y_crosses,
-    H, B, l  # constants
-)
 
-x_start, y_start = (-B/2 + 10, -H/2 + 10)  
-TOTAL_FRAMES = 500
-
-def defined_path(frame, x0, y0):
-    total_frames = TOTAL_FRAMES
-    corner2 = (x0, y0)                     # Start (under left)
-    corner4 = (B/2 - 10, H/2 - 10)           # Upper right
-    corner3 = (B/2 - 10, -H/2 + 10)          # Lower right
-    corner1 = (-B/2 + 10, H/2 - 10)          # Upper left
-    origin = (0, 0)
+from kinematics import H, B, l  # constants
+from kinematics import IN_BOUNDS, STATUS_MESSAGES, rail_x, point_ik, constraint_status
+from trajectory import TOTAL_FRAMES, path_waypoints, fit_path, evaluate_path
 
-    waypoints = [corner2, corner4, origin, corner1, corner3]
-    waypoints_np = np.array(waypoints).T
+x_start, y_start = (-B/2 + 10, -H/2 + 10)  
 
-    tck, _ = splprep(waypoints_np, s=0, k=2)
+_paths = {}
 
-    u = np.linspace(0, 1, total_frames)
-    out = splev(u, tck)
 
-    positions = list(zip(out[0], out[1]))
+def defined_path(frame, x0, y0):
+    # The spline is fitted and sampled once per start point, not once per frame
+    if (x0, y0) not in _paths:
+        tck = fit_path(path_waypoints(x0, y0, B, H))
+        _paths[(x0, y0)] = evaluate_path(tck, np.linspace(0, 1, TOTAL_FRAMES))
+    xs, ys = _paths[(x0, y0)]
 
     # Return position for the current frame
-    return positions[frame]
-
-fig, ax = plt.subplots(figsize=(6, 9))
-fig.patch.set_facecolor('black')
+    return xs[frame], ys[frame]
 
 
-animation_mode = 'once'  # could be 'once', 'loop', or 'stopped'
-frame_counter = 0
-ani = None  # will hold the FuncAnimation object
+def main(save=True, filename="animation_cross.gif"):
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
 
-def update(frame):
-    global frame_counter, animation_mode
+    from rendering import draw_background
 
-    ax.clear()
+    fig, ax = plt.subplots(figsize=(6, 9))
+    fig.patch.set_facecolor('black')
     ax.set_facecolor('black')
 
-    # Draw static elements
-    plot_frame(ax, B, H)
-    plot_side_axes(ax, B, H)
-    plot_origin(ax)
-
-    # Get point position
-    x_P, y_P = defined_path(frame, x_start, y_start)
-
-    # Plot point
-    plot_point_P(ax, x_P, y_P)
+    # Static elements: one cached image, drawn once
+    draw_background(ax, B, H, l)
 
-    # Plot red crosses + check bounds
-    in_bounds = plot_y_crosses(ax, x_P, y_P, B, H)
-
-    if not in_bounds:
-        print(f"STOP: P is out of bounds at frame {frame} (x={x_P:.2f}, y={y_P:.2f})")
-        ani.event_source.stop()  # Freeze plot
+    # Dynamic elements, only their data changes per frame
+    point, = ax.plot([], [], 'ro')  # red point for P
+    label = ax.text(0, 0, "P", color='red')
+    crosses, = ax.plot([], [], 'rx', markersize=10, markeredgewidth=2)
 
     # Style
     ax.set_xlim(-B/2, B/2)
@@ -75,43 +45,71 @@ def update(frame):
     ax.set_title("Moving Point Simulation", color='white')
     ax.tick_params(colors='white')
 
-    # One-time stop condition
-    if animation_mode == 'once' and frame_counter >= TOTAL_FRAMES:
-        ani.event_source.stop()
-    frame_counter += 1
 
-def on_key(event):
-    global ani, animation_mode, frame_counter
+    animation_mode = 'once'  # could be 'once', 'loop', or 'stopped'
+    frame_counter = 0
+    ani = None  # will hold the FuncAnimation object
+
+    def update(frame):
+        nonlocal frame_counter, animation_mode
+
+        # Get point position
+        x_P, y_P = defined_path(frame, x_start, y_start)
+
+        # Move point
+        point.set_data([x_P], [y_P])
+        label.set_position((x_P + 2, y_P))
+
+        # Move red crosses + check bounds
+        ys, ds = point_ik(x_P, y_P, B, H, l)
+        status = constraint_status(ys, ds, H, l)
+        if status == IN_BOUNDS:
+            crosses.set_data(rail_x(B), ys)
+        else:
+            crosses.set_data([], [])
+            print(STATUS_MESSAGES[int(status)])
+            print(f"STOP: P is out of bounds at frame {frame} (x={x_P:.2f}, y={y_P:.2f})")
+            ani.event_source.stop()  # Freeze plot
+
+        # One-time stop condition
+        if animation_mode == 'once' and frame_counter >= TOTAL_FRAMES:
+            ani.event_source.stop()
+        frame_counter += 1
+        return point, label, crosses
+
+    def on_key(event):
+        nonlocal animation_mode, frame_counter
 
-    if event.key == 's':
-        print("Stopping and closing the window.")
-        plt.close(fig)
+        if event.key == 's':
+            print("Stopping and closing the window.")
+            plt.close(fig)
 
-    elif event.key == 'p':
-        print("Playing animation once.")
-        animation_mode = 'once'
-        frame_counter = 0
-        ani.event_source.stop()
-        ani.frame_seq = ani.new_frame_seq()
-        ani.event_source.start()
+        elif event.key == 'p':
+            print("Playing animation once.")
+            animation_mode = 'once'
+            frame_counter = 0
+            ani.event_source.stop()
+            ani.frame_seq = ani.new_frame_seq()
+            ani.event_source.start()
 
-    elif event.key == 'l':
-        print("Playing in infinite loop.")
-        animation_mode = 'loop'
-        ani.event_source.stop()
-        ani.frame_seq = ani.new_frame_seq()
-        ani.event_source.start()
+        elif event.key == 'l':
+            print("Playing in infinite loop.")
+            animation_mode = 'loop'
+            ani.event_source.stop()
+            ani.frame_seq = ani.new_frame_seq()
+            ani.event_source.start()
 
-fig.canvas.mpl_connect('key_press_event', on_key)
+    fig.canvas.mpl_connect('key_press_event', on_key)
 
-animation_mode = 'once'
-save = True
+    animation_mode = 'once'
 
-ani = FuncAnimation(fig, update, frames=TOTAL_FRAMES, interval=100, repeat=False)
+    ani = FuncAnimation(fig, update, frames=TOTAL_FRAMES, interval=100, repeat=False, blit=not save)
 
-if save:
-    ani.save("animation_cross.gif", writer="pillow")
-else:
-    plt.show()
+    if save:
+        ani.save(filename, writer="pillow")
+    else:
+        plt.show()
 
 
+if __name__ == "__main__":
+    main()
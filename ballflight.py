@@ -0,0 +1,221 @@
+"""Ball flight and catch on the square platform, batched over many throws.
+
+A throw is described by the platform's pose trajectory ``(t, poses)``, for
+example the commanded poses of ``dynamics.pose_motion`` or the simulated
+ones from ``dynamics.simulate``. The ball leaves the top face of the square
+at ``t_release`` with that point's velocity. It then flies ballistically and
+is caught if it comes down on the top face (``SQUARE_SIZE`` wide) while the
+platform keeps following its trajectory.
+
+Release errors (timing, speed, angle, position) are drawn per throw, so one
+call gives the catch success rate and the distribution of miss distances for
+a juggling pattern. A ball let go too early or too slowly is not dropped: it
+stays on the face until the face lifts off from under it. Lengths are in
+geometry units, times in seconds.
+"""
+import numpy as np
+
+from square_kinematics import SQUARE_SIZE, LENGTH_UNIT
+
+GRAVITY = 9.81 / LENGTH_UNIT  # geometry units / s^2, along -y
+BALL_RADIUS = 3.0
+N_THROWS = 10_000
+CHUNK_ELEMENTS = 4_000_000  # throws x trajectory samples per chunk
+MIN_CLEARANCE = 0.5  # height above the face the ball must reach before a landing counts
+
+# Standard deviations of the release errors
+RELEASE_ERRORS = {
+    "timing": 2e-3,    # s
+    "speed": 0.02,     # relative
+    "angle": 0.01,     # rad
+    "position": 0.1,   # geometry units, per axis
+}
+
+RESULT_DTYPE = np.dtype([
+    ("released", "?"),       # False if the face never lifts off after the release time
+    ("t_release", "f8"),     # when the ball actually leaves the face (see settle_release)
+    ("caught", "?"),
+    ("miss", "f8"),          # distance past the edge of the top face (< 0 = on the face)
+    ("t_catch", "f8"),
+    ("impact_speed", "f8"),  # ball speed relative to the platform at the catch
+])
+
+
+# === Platform state along the trajectory ===
+def platform_state(t, poses, t_query):
+    """Interpolated pose ``(..., 3)`` and pose rate ``(..., 3)`` at ``t_query``."""
+    t = np.asarray(t, dtype=float)
+    poses = np.asarray(poses, dtype=float)
+    rates = np.gradient(poses, t, axis=0)
+    pose = np.stack([np.interp(t_query, t, poses[:, k]) for k in range(3)], axis=-1)
+    rate = np.stack([np.interp(t_query, t, rates[:, k]) for k in range(3)], axis=-1)
+    return pose, rate
+
+
+def _top_frame(pose, square_size, radius):
+    """Ball-centre point above the top face and the face's normal, for poses ``(..., 3)``."""
+    c, s = np.cos(pose[..., 2]), np.sin(pose[..., 2])
+    normal = np.stack([-s, c], axis=-1)
+    offset = (np.asarray(square_size, dtype=float) / 2 + radius)[..., None] * normal
+    return pose[..., :2] + offset, offset, normal
+
+
+def release_state(t, poses, t_release, square_size=SQUARE_SIZE, radius=BALL_RADIUS):
+    """Ball position and velocity when it leaves the platform at ``t_release``."""
+    pose, rate = platform_state(t, poses, t_release)
+    position, arm, _ = _top_frame(pose, square_size, radius)
+    omega = rate[..., 2:3]
+    velocity = rate[..., :2] + omega * np.stack([-arm[..., 1], arm[..., 0]], axis=-1)
+    return position, velocity
+
+
+def _lift_margin(t, poses, gravity):
+    """Face acceleration along its normal plus gravity's share; negative where a resting ball lifts off."""
+    acc = np.gradient(np.gradient(poses[:, :2], t, axis=0), t, axis=0)
+    normal = np.stack([-np.sin(poses[:, 2]), np.cos(poses[:, 2])], axis=-1)
+    return np.sum(acc * normal, axis=-1) + gravity * normal[:, 1]
+
+
+def separation_time(t, poses, t_from=0.0, gravity=GRAVITY):
+    """First time after ``t_from`` the platform decelerates faster than gravity: the ball lifts off."""
+    t = np.asarray(t, dtype=float)
+    poses = np.asarray(poses, dtype=float)
+    lifting = (_lift_margin(t, poses, gravity) < 0) & (t >= t_from)
+    return t[np.argmax(lifting)] if lifting.any() else np.nan
+
+
+def settle_release(t0, p0, v0, t, poses, square_size=SQUARE_SIZE, radius=BALL_RADIUS, gravity=GRAVITY):
+    """Move each release to the moment the ball really leaves the face.
+
+    A ball let go while the face still pushes it (before lift-off) rides on
+    the face and leaves at the next lift-off with the face's state. A ball
+    that leaves slower than the face along the normal is pushed along, so
+    its normal velocity becomes the face's. Returns ``(t_release, p, v)``;
+    ``t_release`` is NaN where the face never lifts off after ``t0``.
+    """
+    t = np.asarray(t, dtype=float)
+    poses = np.asarray(poses, dtype=float)
+    t0 = np.asarray(t0, dtype=float)
+    margin = _lift_margin(t, poses, gravity)
+    samples = np.arange(len(t))
+    # Next lift-off sample at or after every sample (len(t) if none)
+    following = np.minimum.accumulate(np.where(margin < 0, samples, len(t))[::-1])[::-1]
+    k = following[np.minimum(np.searchsorted(t, t0), len(t) - 1)]
+    later = np.where(k < len(t), t[np.minimum(k, len(t) - 1)], np.nan)
+    riding = ~(np.interp(t0, t, margin) < 0)
+    t_release = np.where(riding, later, t0)
+
+    p_face, v_face = release_state(t, poses, t_release, square_size, radius)
+    p = np.where(riding[..., None], p_face, p0)
+    v = np.where(riding[..., None], v_face, v0)
+    pose, _ = platform_state(t, poses, t_release)
+    normal = _top_frame(pose, square_size, radius)[2]
+    slower = np.minimum(np.sum((v - v_face) * normal, axis=-1), 0.0)
+    return t_release, p, v - slower[..., None] * normal
+
+
+# === Release errors ===
+def perturbed_releases(t, poses, t_release, n_throws=N_THROWS, errors=RELEASE_ERRORS, seed=0,
+                       square_size=SQUARE_SIZE, radius=BALL_RADIUS):
+    """Draw ``n_throws`` release states around the nominal one; returns ``(t0, p0, v0)``."""
+    rng = np.random.default_rng(seed)
+    t0 = t_release + rng.normal(0, errors["timing"], n_throws)
+    p0, v0 = release_state(t, poses, t0, square_size, radius)
+    p0 = p0 + rng.normal(0, errors["position"], (n_throws, 2))
+
+    angle = rng.normal(0, errors["angle"], n_throws)
+    gain = 1 + rng.normal(0, errors["speed"], n_throws)
+    c, s = np.cos(angle), np.sin(angle)
+    v0 = gain[:, None] * np.stack([c * v0[:, 0] - s * v0[:, 1], s * v0[:, 0] + c * v0[:, 1]], axis=-1)
+    return t0, p0, v0
+
+
+# === Catch detection ===
+def catch_events(t0, p0, v0, t, poses, square_size=SQUARE_SIZE, radius=BALL_RADIUS,
+                 gravity=GRAVITY, chunk_elements=CHUNK_ELEMENTS):
+    """Find where each ball comes down through the top face of the moving square.
+
+    The ball centre is expressed in the platform frame at every trajectory
+    sample after it really leaves the face (``settle_release``); the catch is
+    the first sample where its height above the face drops from positive to
+    zero or below, refined by linear interpolation. Only landings after the
+    ball has cleared the face by ``MIN_CLEARANCE`` count. Balls that never
+    come down before the trajectory ends are misses with NaN distance.
+    Returns a RESULT_DTYPE array.
+    """
+    t = np.asarray(t, dtype=float)
+    poses = np.asarray(poses, dtype=float)
+    t0, p0, v0 = settle_release(t0, p0, v0, t, poses, square_size, radius, gravity)
+    cos, sin = np.cos(poses[:, 2]), np.sin(poses[:, 2])
+    rates = np.gradient(poses, t, axis=0)
+    half = np.asarray(square_size, dtype=float) / 2
+
+    results = np.zeros(len(t0), dtype=RESULT_DTYPE)
+    results["released"] = np.isfinite(t0)
+    results["t_release"] = t0
+    results["miss"] = results["t_catch"] = results["impact_speed"] = np.nan
+    chunk = max(1, int(chunk_elements // len(t)))
+
+    for start in range(0, len(t0), chunk):
+        sl = slice(start, start + chunk)
+        tau = t[None, :] - t0[sl, None]
+        bx = p0[sl, 0:1] + v0[sl, 0:1] * tau
+        by = p0[sl, 1:2] + v0[sl, 1:2] * tau - gravity / 2 * tau**2
+        dx, dy = bx - poses[:, 0], by - poses[:, 1]
+        along = cos * dx + sin * dy
+        height = -sin * dx + cos * dy - half - radius
+
+        flying = np.where(tau >= 0, height, -np.inf)
+        cleared = np.maximum.accumulate(flying, axis=1) >= MIN_CLEARANCE
+        crossing = (height[:, :-1] > 0) & (height[:, 1:] <= 0) & cleared[:, :-1]
+        found = crossing.any(axis=1)
+        j = np.argmax(crossing, axis=1)[found]
+        rows = np.nonzero(found)[0]
+        h0, h1 = height[rows, j], height[rows, j + 1]
+        f = h0 / (h0 - h1)
+        x_catch = along[rows, j] + f * (along[rows, j + 1] - along[rows, j])
+        t_catch = t[j] + f * (t[j + 1] - t[j])
+
+        # Relative velocity at the catch point (ball minus platform surface)
+        tau_c = t_catch - t0[sl][rows]
+        vb = np.stack([v0[sl][rows, 0], v0[sl][rows, 1] - gravity * tau_c], axis=-1)
+        omega = rates[j, 2]
+        rx = bx[rows, j] - poses[j, 0]
+        ry = by[rows, j] - poses[j, 1]
+        vp = rates[j, :2] + omega[:, None] * np.stack([-ry, rx], axis=-1)
+
+        out = results[sl]
+        out["miss"][rows] = np.abs(x_catch) - half
+        out["caught"][rows] = np.abs(x_catch) <= half
+        out["t_catch"][rows] = t_catch
+        out["impact_speed"][rows] = np.linalg.norm(vb - vp, axis=-1)
+    return results
+
+
+def simulate_throws(t, poses, t_release=None, n_throws=N_THROWS, errors=RELEASE_ERRORS, seed=0,
+                    square_size=SQUARE_SIZE, radius=BALL_RADIUS, gravity=GRAVITY):
+    """Throw ``n_throws`` perturbed balls from one platform trajectory and try to catch them.
+
+    ``t_release`` defaults to the moment the ball lifts off the platform.
+    """
+    if t_release is None:
+        t_release = separation_time(t, poses, gravity=gravity)
+        if np.isnan(t_release):
+            raise ValueError("The platform never decelerates fast enough to release the ball")
+    t0, p0, v0 = perturbed_releases(t, poses, t_release, n_throws, errors, seed, square_size, radius)
+    return catch_events(t0, p0, v0, t, poses, square_size, radius, gravity)
+
+
+def summarize(results, percentiles=(50, 95, 99)):
+    """Success rate and miss-distance percentiles of a batch of throws."""
+    landed = results["miss"][~np.isnan(results["miss"])]
+    released = int(np.count_nonzero(results["released"]))
+    summary = {
+        "throws": len(results),
+        "success_rate": float(np.mean(results["caught"])) if len(results) else np.nan,
+        "failed_releases": len(results) - released,
+        "not_landed": released - len(landed),
+    }
+    for p in percentiles:
+        summary[f"miss_p{p}"] = float(np.percentile(landed, p)) if len(landed) else np.nan
+    return summary
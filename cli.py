@@ -0,0 +1,189 @@
+"""Command line entry point: ``python cli.py <command> [options]``.
+
+Only argparse and the standard library are imported up front. Every command
+imports what it needs when it runs, so headless commands (workspace, sweep,
+bench) never load matplotlib, and nothing loads scipy unless a spline or
+solver is actually used.
+"""
+import argparse
+import importlib
+import sys
+import time
+
+
+def cmd_workspace(args):
+    import workspace_maps
+
+    packed = workspace_maps.workspace_map(args.B, args.H, args.l, args.gap, args.resolution)
+    print(f"B={args.B:g} H={args.H:g} l={args.l:g} gap={args.gap:g}: "
+          f"{packed.area():.1f} units^2 reachable ({100 * packed.fraction():.1f}% of the frame, "
+          f"{packed.nbytes() / 1e6:.1f} MB packed)")
+    if args.out:
+        packed.save(args.out)
+        print(f"Map saved to {args.out}.npy / {args.out}.json")
+    if args.plot:
+        import matplotlib.pyplot as plt
+
+        factor = max(1, max(packed.shape) // 2000)  # no more pixels than the screen can show
+        fig, ax = plt.subplots(figsize=(6, 9))
+        ax.imshow(packed.downsample(factor) if factor > 1 else packed.to_dense(), extent=packed.extent,
+                  origin='lower', cmap='Greens', interpolation='nearest')
+        ax.set_title(f"Workspace {args.B:g}x{args.H:g}+{args.l:g}")
+        ax.set_aspect('equal')
+        plt.show()
+
+
+def cmd_sweep(args):
+    import workspace_maps
+
+    print(f"{'B':>8} {'H':>8} {'l':>8} {'area':>10} {'fraction':>9}")
+    for B in args.B:
+        for H in args.H:
+            for l in args.l:
+                packed = workspace_maps.workspace_map(B, H, l, args.gap, args.resolution)
+                print(f"{B:8g} {H:8g} {l:8g} {packed.area():10.1f} {packed.fraction():9.3f}")
+
+
+def cmd_design(args):
+    import design
+
+    print(f"{'design':>12} {'area':>10} {'rectangle':>10} {'margin':>8}")
+    for name, scores in design.compare_designs().items():
+        print(f"{name:>12} {scores['area']:10.1f} {scores['rectangle']:10.1f} {scores['margin']:8.2f}")
+    if args.optimise:
+        best = design.optimise(args.objective, max_cost=args.max_cost, maxiter=args.maxiter)
+        print(f"Best {args.objective}: {best[args.objective]:.1f} with B={best['B']:.1f} H={best['H']:.1f} "
+              f"l={best['l']:.1f} gap={best['gap']:.1f} (cost {best['cost']:.1f}, "
+              f"{best['evaluations']} evaluations)")
+
+
+def cmd_check(args):
+    import singularity
+
+    limits = dict(singularity.LIMITS, speed=args.max_speed, acceleration=args.max_acc,
+                  condition=args.max_cond, margin=args.min_margin)
+    report = singularity.defined_path_report(args.duration, args.frames, limits=limits)
+    segments = singularity.flagged_segments(report)
+    for start, stop, flags in segments:
+        print(f"frames {start}-{stop - 1} (t={report['t'][start]:.2f}-{report['t'][stop - 1]:.2f} s): "
+              f"{singularity.describe_flags(flags)}")
+    if args.report:
+        print("\n".join(singularity.format_report(report, only_flagged=not args.all)))
+    print(f"{len(segments)} flagged segment(s), {(report['flags'] != 0).sum()} of {len(report)} frames; "
+          f"peak speed {report['speed'].max():.1f}, peak acceleration {report['acceleration'].max():.1f}")
+    if args.plot:
+        import matplotlib.pyplot as plt
+
+        import kinematics
+        from rendering import draw_background
+
+        fig, ax = plt.subplots(figsize=(6, 9))
+        fig.patch.set_facecolor('black')
+        draw_background(ax)
+        lines = singularity.heat_overlay(ax, report, args.key, limits[args.key])
+        fig.colorbar(lines, ax=ax, label=f"{args.key} / limit")
+        ax.set_xlim(-kinematics.B / 2 - 2, kinematics.B / 2 + 2)
+        ax.set_ylim(-kinematics.H / 2 - 2, kinematics.H / 2 + 2)
+        ax.set_aspect('equal')
+        plt.show()
+    return 1 if segments else 0
+
+
+def cmd_animate(args):
+    animation = importlib.import_module("2D_sim_animation")
+    animation.main(save=args.save is not None, filename=args.save)
+
+
+def cmd_jog(args):
+    importlib.import_module("2dsim_pos").main()
+
+
+def cmd_bench(args):
+    import numpy as np
+
+    import kinematics
+    import square_kinematics
+
+    rng = np.random.default_rng(0)
+    n = args.samples
+    x = rng.uniform(-20, 20, n)
+    y = rng.uniform(-40, 40, n)
+    pose = np.stack([rng.uniform(-4, 4, n), rng.uniform(-15, 15, n), rng.uniform(-0.2, 0.2, n)], axis=-1)
+    carriages, _ = kinematics.point_ik(x, y)
+    square_carriages = square_kinematics.square_ik(pose[:, 0], pose[:, 1], pose[:, 2])
+
+    cases = [
+        ("point IK", lambda: kinematics.point_ik(x, y)),
+        ("point FK", lambda: kinematics.point_fk(carriages)),
+        ("square IK", lambda: square_kinematics.square_ik(pose[:, 0], pose[:, 1], pose[:, 2])),
+        ("square FK", lambda: square_kinematics.square_fk(square_carriages)),
+    ]
+    for name, run in cases:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print(f"{name:10s} {n} samples in {elapsed * 1e3:8.2f} ms ({elapsed / n * 1e9:7.1f} ns/sample)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="XTS cable robot tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def geometry(p, multiple=False):
+        nargs = "+" if multiple else None
+        p.add_argument("--B", type=float, nargs=nargs, default=[56.0] if multiple else 56.0, help="frame width")
+        p.add_argument("--H", type=float, nargs=nargs, default=[100.0] if multiple else 100.0, help="frame height")
+        p.add_argument("--l", type=float, nargs=nargs, default=[100.0] if multiple else 100.0, help="cable length")
+        p.add_argument("--gap", type=float, default=10.0, help="roller clearance")
+        p.add_argument("--resolution", type=int, default=500, help="grid cells along the longer side")
+
+    p = commands.add_parser("workspace", help="reachable workspace of P for one geometry")
+    geometry(p)
+    p.add_argument("--out", help="save the packed map as OUT.npy + OUT.json")
+    p.add_argument("--plot", action="store_true", help="show the workspace")
+    p.set_defaults(func=cmd_workspace)
+
+    p = commands.add_parser("sweep", help="workspace area over a grid of geometries")
+    geometry(p, multiple=True)
+    p.set_defaults(func=cmd_sweep)
+
+    p = commands.add_parser("design", help="score the known frames and optimise B, H, l and gap")
+    p.add_argument("--optimise", action="store_true", help="search for the best design")
+    p.add_argument("--objective", choices=("area", "rectangle", "margin"), default="area")
+    p.add_argument("--max-cost", type=float, default=312.0, help="limit on the frame profile length 2(B+H)")
+    p.add_argument("--maxiter", type=int, default=100)
+    p.set_defaults(func=cmd_design)
+
+    p = commands.add_parser("check", help="flag carriage speed/acceleration/conditioning limits along the path")
+    p.add_argument("--duration", type=float, default=50.0, help="seconds to traverse the path")
+    p.add_argument("--frames", type=int, default=500)
+    p.add_argument("--max-speed", type=float, default=400.0)
+    p.add_argument("--max-acc", type=float, default=1e4)
+    p.add_argument("--max-cond", type=float, default=50.0)
+    p.add_argument("--min-margin", type=float, default=2.0, help="distance to the rail ends")
+    p.add_argument("--report", action="store_true", help="print the per-frame report")
+    p.add_argument("--all", action="store_true", help="report every frame, not only flagged ones")
+    p.add_argument("--plot", action="store_true", help="show the path coloured by --key")
+    p.add_argument("--key", choices=("speed", "acceleration", "condition"), default="speed")
+    p.set_defaults(func=cmd_check)
+
+    p = commands.add_parser("animate", help="run the moving point animation")
+    p.add_argument("--save", metavar="GIF", help="write the animation to a GIF instead of showing it")
+    p.set_defaults(func=cmd_animate)
+
+    p = commands.add_parser("jog", help="interactive carriage jogging of the square platform")
+    p.set_defaults(func=cmd_jog)
+
+    p = commands.add_parser("bench", help="time the batched kinematics")
+    p.add_argument("--samples", type=int, default=1_000_000)
+    p.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
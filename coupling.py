@@ -0,0 +1,97 @@
+"""Coupled carriage motion for the square platform of ``2dsim_pos.py``.
+
+Jogging one carriage moves the others according to a coupling rule. The rule
+of ``update_carriages`` is the linear matrix ``MIRROR_COUPLING``: row ``i``
+is the change of CAR1..CAR4 per unit move of carriage ``i``. The mover
+follows the command, its rail partner stays put and the opposite pair
+shifts by ``-delta/2`` and ``+delta/2``.
+
+Because a linear rule does not depend on the current state, a whole command
+sequence is one ``cumsum`` of per-step increments. The resulting carriage
+states go through ``square_fk`` in one batch, so long jog or teach-in
+sequences (or several coupling schemes side by side) are evaluated in one
+vectorized pass. A user-defined rule can be any callable
+``coupling(index, delta) -> increments`` that works on arrays of commands.
+"""
+import numpy as np
+
+import square_kinematics
+from square_kinematics import FRAME_SIZE, LINK_LENGTH, SQUARE_SIZE
+
+INITIAL_CARRIAGES = np.array([35.0, -35.0, -35.0, 35.0])  # CAR1..CAR4 start heights
+
+# Rows: moved carriage CAR1..CAR4; columns: change of CAR1..CAR4 per unit delta
+MIRROR_COUPLING = np.array([
+    [1.0, 0.0, -0.5, 0.5],   # CAR1: CAR2 fixed, CAR3/CAR4 mirror
+    [0.0, 1.0, -0.5, 0.5],   # CAR2: CAR1 fixed, CAR3/CAR4 mirror
+    [-0.5, 0.5, 1.0, 0.0],   # CAR3: CAR4 fixed, CAR1/CAR2 mirror
+    [-0.5, 0.5, 0.0, 1.0],   # CAR4: CAR3 fixed, CAR1/CAR2 mirror
+])
+
+# Uncoupled jogging: only the commanded carriage moves
+INDEPENDENT_COUPLING = np.eye(4)
+
+# Jog keys of 2dsim_pos: key -> (carriage index, direction)
+KEYMAP = {
+    'a': (0, +1), 'z': (0, -1),  # CAR1 up / down
+    'w': (1, +1), 'x': (1, -1),  # CAR2
+    'e': (2, +1), 'c': (2, -1),  # CAR3
+    'r': (3, +1), 'v': (3, -1),  # CAR4
+}
+
+
+def increments(index, delta, coupling=MIRROR_COUPLING):
+    """Carriage changes ``(..., 4)`` for commands moving carriage ``index`` by ``delta``."""
+    index = np.asarray(index)
+    if np.any((index < 0) | (index > 3)):
+        raise ValueError("Invalid carriage index")
+    delta = np.asarray(delta, dtype=float)
+    if callable(coupling):
+        return np.asarray(coupling(index, delta), dtype=float)
+    return delta[..., None] * np.asarray(coupling, dtype=float)[index]
+
+
+def apply_command(ys, index, delta, coupling=MIRROR_COUPLING):
+    """Carriage heights after one command."""
+    return np.asarray(ys, dtype=float) + increments(index, delta, coupling)
+
+
+def keys_to_commands(keys, delta=1.0):
+    """Turn a string of jog keys into ``(indices, deltas)`` arrays; unknown keys are skipped."""
+    pairs = [KEYMAP[k] for k in keys if k in KEYMAP]
+    indices = np.array([p[0] for p in pairs], dtype=np.intp)
+    deltas = np.array([p[1] for p in pairs], dtype=float) * delta
+    return indices, deltas
+
+
+def carriage_sequence(indices, deltas, y0=INITIAL_CARRIAGES, coupling=MIRROR_COUPLING):
+    """Carriage heights after every command of a sequence, shape ``(n, 4)``."""
+    return np.asarray(y0, dtype=float) + np.cumsum(increments(indices, deltas, coupling), axis=0)
+
+
+def replay_sequence(indices, deltas, y0=INITIAL_CARRIAGES, coupling=MIRROR_COUPLING,
+                    link_length=LINK_LENGTH, frame_size=FRAME_SIZE, square_size=SQUARE_SIZE):
+    """Carriage states and platform poses for a whole command sequence.
+
+    Returns ``(ys, poses, residuals, margins)``. ``residuals`` are the link
+    length errors left by the FK (large where the links cannot close), and
+    ``margins`` the distance of the nearest carriage to its rail end
+    (negative = off the rail).
+    """
+    ys = carriage_sequence(indices, deltas, y0, coupling)
+    poses, residuals = square_kinematics.square_fk(ys, link_length=link_length, frame_size=frame_size,
+                                                   square_size=square_size)
+    return ys, poses, residuals, square_kinematics.rail_margin(ys, frame_size)
+
+
+def compare_couplings(indices, deltas, couplings, y0=INITIAL_CARRIAGES, **geometry):
+    """Replay one sequence under several coupling schemes, batched in a single FK call.
+
+    ``couplings`` maps a name to a matrix or callable; returns
+    ``{name: (ys, poses, residuals, margins)}``.
+    """
+    names = list(couplings)
+    ys = np.stack([carriage_sequence(indices, deltas, y0, couplings[name]) for name in names])
+    poses, residuals = square_kinematics.square_fk(ys, **geometry)
+    margins = square_kinematics.rail_margin(ys, geometry.get("frame_size", FRAME_SIZE))
+    return {name: (ys[k], poses[k], residuals[k], margins[k]) for k, name in enumerate(names)}
@@ -0,0 +1,188 @@
+"""Frame design: fast workspace evaluation and an optimiser over B, H, l and gap.
+
+Every constraint of ``plot_y_crosses`` has a boundary that is a conic in the
+plane of P:
+
+* ``d_i = l`` (cable too short) and ``d_i = l - H`` (y_max reached):
+  circles around the corners;
+* ``d_i = l - H/2``: circles where ``y_i`` changes sign (kinks of |y_i|);
+* ``|y1| + |y2| = gap``: ellipses ``d1 + d2 = 2l - H +- gap`` and
+  hyperbolas ``|d1 - d2| = gap`` with the two corners of a rail as foci
+  (and the same for the right rail).
+
+On a vertical line x = const these curves cross at a handful of heights,
+found in closed form. Between consecutive crossings feasibility cannot
+change, so one IK check per interval gives the exact feasible length of the
+column. The area is a quadrature of these column lengths over x; the
+workspace is symmetric in x and y, so only one quadrant is evaluated. This
+replaces counting a 500 x 500 grid with a few thousand point checks.
+
+From the same columns come the largest centred axis-aligned rectangle and
+the largest centred disc ("margin"), the other design objectives.
+"""
+import numpy as np
+
+import kinematics
+
+COLUMNS = 32  # quadrature columns over half the frame width
+
+# The frames tried so far (BC_HxB+l.png): name -> (B, H, l, gap)
+KNOWN_DESIGNS = {
+    "100x56+100": (56.0, 100.0, 100.0, kinematics.ROLLER_GAP),
+    "100x60+100": (60.0, 100.0, 100.0, kinematics.ROLLER_GAP),
+    "100x86+97": (86.0, 100.0, 97.0, kinematics.ROLLER_GAP),
+    "100x100+100": (100.0, 100.0, 100.0, kinematics.ROLLER_GAP),
+}
+
+# Search box for (B, H, l, gap)
+BOUNDS = ((30.0, 120.0), (60.0, 150.0), (50.0, 150.0), (5.0, 20.0))
+MAX_COST = 2 * (56.0 + 100.0)  # frame profile length of the current machine
+
+
+# === Column geometry ===
+def _circle_heights(x, centres, radii):
+    """Heights where the line x crosses circles of ``radii`` about ``centres``, ``(n, k)``."""
+    dx = x[:, None, None] - centres[None, :, None, 0]
+    r = np.asarray(radii, dtype=float)[None, None, :]
+    with np.errstate(invalid="ignore"):
+        h = np.sqrt(np.where(r > 0, r**2 - dx**2, np.nan))
+    cy = centres[None, :, None, 1]
+    return np.concatenate([(cy + h).reshape(len(x), -1), (cy - h).reshape(len(x), -1)], axis=1)
+
+
+def _rail_pair_heights(u, H, sums, gap):
+    """Heights of the ellipses d1 + d2 = s and hyperbolas |d1 - d2| = gap of one rail.
+
+    ``u`` is the horizontal distance to the rail; the foci are the rail ends at +-H/2.
+    """
+    c2 = (H / 2)**2
+    out = []
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for s in sums:
+            a = s / 2
+            b2 = a**2 - c2
+            y = a * np.sqrt(1 - u**2 / b2) if b2 > 0 else np.full_like(u, np.nan)
+            out += [y, -y]
+        A = gap / 2
+        b2 = c2 - A**2
+        y = A * np.sqrt(1 + u**2 / b2) if b2 > 0 else np.full_like(u, np.nan)
+        out += [y, -y]
+    return np.stack(out, axis=1)
+
+
+def column_intervals(x, B=kinematics.B, H=kinematics.H, l=kinematics.l, gap=kinematics.ROLLER_GAP):
+    """Split the upper half of each column ``x`` into intervals of constant feasibility.
+
+    Returns ``(edges, feasible)``: interval edges ``(n, k + 1)`` from 0 to H/2
+    and a feasibility flag per interval ``(n, k)``.
+    """
+    x = np.asarray(x, dtype=float)
+    corner_xy = kinematics.corners(B, H)
+    heights = [
+        _circle_heights(x, corner_xy, (l, l - H, l - H / 2)),
+        _rail_pair_heights(x + B / 2, H, (2 * l - H + gap, 2 * l - H - gap), gap),
+        _rail_pair_heights(B / 2 - x, H, (2 * l - H + gap, 2 * l - H - gap), gap),
+    ]
+    cuts = np.concatenate(heights, axis=1)
+    cuts = np.clip(np.where(np.isfinite(cuts), cuts, 0.0), 0.0, H / 2)
+    zeros = np.zeros((len(x), 1))
+    edges = np.sort(np.concatenate([zeros, cuts, zeros + H / 2], axis=1), axis=1)
+    mid = (edges[:, 1:] + edges[:, :-1]) / 2
+    return edges, _feasible(x[:, None], mid, B, H, l, gap)
+
+
+def _feasible(x, y, B, H, l, gap):
+    """``in_workspace`` without the status bookkeeping."""
+    masks = kinematics.constraint_masks(kinematics.cable_lengths(x, y, B, H), H, l, gap)
+    return masks["cable"] & masks["y_max"] & masks["rollers"]
+
+
+def column_profiles(B=kinematics.B, H=kinematics.H, l=kinematics.l, gap=kinematics.ROLLER_GAP,
+                    columns=COLUMNS):
+    """Per column of the right half: ``(x, chord, central)``.
+
+    ``chord`` is the feasible length in ``0 <= y <= H/2``; ``central`` the
+    height up to which the column is feasible without a break from y = 0.
+    """
+    dx = B / 2 / columns
+    x = (np.arange(columns) + 0.5) * dx
+    edges, feasible = column_intervals(x, B, H, l, gap)
+    lengths = np.diff(edges, axis=1)
+    chord = np.sum(np.where(feasible, lengths, 0.0), axis=1)
+    blocked = ~feasible & (lengths > 0)
+    first = np.argmax(blocked, axis=1)
+    central = np.where(blocked.any(axis=1), edges[np.arange(columns), first], H / 2)
+    return x, chord, central
+
+
+# === Objectives ===
+def workspace_area(B=kinematics.B, H=kinematics.H, l=kinematics.l, gap=kinematics.ROLLER_GAP,
+                   columns=COLUMNS):
+    """Reachable area of P (units^2)."""
+    x, chord, _ = column_profiles(B, H, l, gap, columns)
+    return 4 * np.sum(chord) * (B / 2 / columns)
+
+
+def inscribed_rectangle(B=kinematics.B, H=kinematics.H, l=kinematics.l, gap=kinematics.ROLLER_GAP,
+                        columns=COLUMNS):
+    """Largest centred axis-aligned rectangle in the workspace; returns ``(area, width, height)``."""
+    x, _, central = column_profiles(B, H, l, gap, columns)
+    half_height = np.minimum.accumulate(central)
+    areas = 4 * x * half_height
+    k = int(np.argmax(areas))
+    return areas[k], 2 * x[k], 2 * half_height[k]
+
+
+def margin(B=kinematics.B, H=kinematics.H, l=kinematics.l, gap=kinematics.ROLLER_GAP, columns=COLUMNS):
+    """Radius of the largest disc around the origin that lies in the workspace."""
+    x, _, central = column_profiles(B, H, l, gap, columns)
+    if central[0] == 0:
+        return 0.0
+    return float(min(B / 2, np.min(np.hypot(x, central))))
+
+
+OBJECTIVES = {
+    "area": workspace_area,
+    "rectangle": lambda *p, **kw: inscribed_rectangle(*p, **kw)[0],
+    "margin": margin,
+}
+
+
+def frame_cost(B, H, l, gap):
+    """Frame profile length 2 (B + H): the cost constraint used by default."""
+    return 2 * (B + H)
+
+
+# === Optimiser ===
+def optimise(objective="area", bounds=BOUNDS, max_cost=MAX_COST, cost=frame_cost,
+             columns=COLUMNS, maxiter=100, seed=0):
+    """Maximise ``objective`` over (B, H, l, gap) with ``cost(B, H, l, gap) <= max_cost``.
+
+    Uses scipy's differential evolution; the evaluator is cheap enough for
+    thousands of evaluations. Returns a dict with the best design.
+    """
+    from scipy.optimize import NonlinearConstraint, differential_evolution
+
+    evaluate = OBJECTIVES[objective]
+    result = differential_evolution(
+        lambda p: -evaluate(*p, columns=columns),
+        bounds,
+        constraints=NonlinearConstraint(lambda p: cost(*p), -np.inf, max_cost),
+        maxiter=maxiter,
+        seed=seed,
+        polish=False,
+        tol=1e-6,
+    )
+    B, H, l, gap = result.x
+    return {
+        "B": B, "H": H, "l": l, "gap": gap,
+        objective: -result.fun,
+        "cost": cost(B, H, l, gap),
+        "evaluations": result.nfev,
+    }
+
+
+def compare_designs(designs=KNOWN_DESIGNS, columns=COLUMNS):
+    """All objectives for a set of named designs ``{name: (B, H, l, gap)}``."""
+    return {name: {key: f(*p, columns=columns) for key, f in OBJECTIVES.items()}
+            for name, p in designs.items()}
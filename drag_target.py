@@ -0,0 +1,138 @@
+"""Interactive point targeting: drag P around the frame with the mouse.
+
+The frame and workspace overlay come from the cached background raster
+(``rendering``). Mouse motion only records the latest target; a timer running
+at display refresh rate runs the IK on it and blits the carriage crosses,
+cables and constraint status on top, so fast mouse moves never queue up
+full-figure redraws.
+"""
+import matplotlib.pyplot as plt
+import numpy as np
+
+from kinematics import (
+    B, H, l, ROLLER_GAP,
+    IN_BOUNDS, LINK_TOO_SHORT, STATUS_MESSAGES,
+    corners, rail_x, point_ik, constraint_status,
+)
+from rendering import draw_background
+
+REFRESH_MS = 16  # ~60 Hz: at most one redraw per display refresh
+
+
+class DragTarget:
+    """Keeps the dynamic artists and the pending mouse target for one axes."""
+
+    def __init__(self, ax, x_P=10, y_P=10, B=B, H=H, l=l, gap=ROLLER_GAP):
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.B, self.H, self.l, self.gap = B, H, l, gap
+        self.corners = corners(B, H)
+        self.rails = rail_x(B)
+        self.target = (x_P, y_P)
+        self.pending = self.target
+        self.dragging = False
+        self.background = None
+
+        # Static scenery and workspace overlay: one cached image
+        draw_background(ax, B, H, l, gap, overlay="workspace")
+
+        # Dynamic artists, only ever drawn through draw_artist/blit
+        self.cables, = ax.plot([], [], color='orange', linewidth=1, animated=True)
+        self.crosses, = ax.plot([], [], 'rx', markersize=10, markeredgewidth=2, animated=True)
+        self.point, = ax.plot([], [], 'ro', animated=True)
+        self.status = ax.text(0.02, 0.98, "", transform=ax.transAxes, va='top',
+                              color='white', animated=True)
+        self.artists = (self.cables, self.crosses, self.point, self.status)
+
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+        self.canvas.mpl_connect('button_press_event', self.on_press)
+        self.canvas.mpl_connect('motion_notify_event', self.on_motion)
+        self.canvas.mpl_connect('button_release_event', self.on_release)
+
+        self.timer = self.canvas.new_timer(interval=REFRESH_MS)
+        self.timer.add_callback(self.flush)
+        self.timer.start()
+
+    # === Event handling: only record the latest target ===
+    def on_press(self, event):
+        if event.inaxes is self.ax and event.button == 1:
+            self.dragging = True
+            self.pending = (event.xdata, event.ydata)
+
+    def on_motion(self, event):
+        if self.dragging and event.inaxes is self.ax:
+            self.pending = (event.xdata, event.ydata)
+
+    def on_release(self, event):
+        self.dragging = False
+
+    def on_draw(self, event):
+        """Full redraw (resize, zoom): refresh the cached background."""
+        if self.canvas.supports_blit:
+            self.background = self.canvas.copy_from_bbox(self.ax.figure.bbox)
+        self.update_artists()
+        self.draw_artists()
+
+    # === Redraw at most once per timer tick ===
+    def flush(self):
+        if self.pending is None:
+            return
+        self.target = self.pending
+        self.pending = None
+        self.update_artists()
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self.draw_artists()
+        self.canvas.blit(self.ax.figure.bbox)
+
+    def update_artists(self):
+        x_P, y_P = self.target
+        ys, ds = point_ik(x_P, y_P, self.B, self.H, self.l)
+        status = int(constraint_status(ys, ds, self.H, self.l, self.gap))
+
+        self.point.set_data([x_P], [y_P])
+        if status == LINK_TOO_SHORT:
+            self.cables.set_data([], [])
+            self.crosses.set_data([], [])
+        else:
+            # carriage -> corner -> P per cable, NaN-separated in one line
+            segments = np.full((4, 4, 2), np.nan)
+            segments[:, 0, 0] = self.rails
+            segments[:, 0, 1] = ys
+            segments[:, 1] = self.corners
+            segments[:, 2] = (x_P, y_P)
+            self.cables.set_data(segments[..., 0].ravel(), segments[..., 1].ravel())
+            self.crosses.set_data(self.rails, ys)
+
+        self.status.set_text(f"P = ({x_P:.1f}, {y_P:.1f})  {STATUS_MESSAGES[status]}")
+        self.status.set_color('lime' if status == IN_BOUNDS else 'red')
+
+    def draw_artists(self):
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
+
+
+def main():
+    fig, ax = plt.subplots(figsize=(6, 9))
+
+    # Zwarte achtergrond
+    fig.patch.set_facecolor('black')
+    ax.set_facecolor('black')
+
+    ax.set_xlim(-B / 2 - 5, B / 2 + 5)
+    ax.set_ylim(-H / 2 - 5, H / 2 + 5)
+    ax.set_title("Drag P with the mouse", color='white')
+    ax.set_xlabel("X", color='white')
+    ax.set_ylabel("Y", color='white')
+    ax.tick_params(colors='white')
+    ax.set_aspect('equal')
+
+    target = DragTarget(ax)
+    plt.show()
+    return target
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""Batched rigid-body dynamics of the square platform on compliant links.
+
+The square of ``2dsim_pos.py`` gets a mass and inertia, and every link
+becomes an axial spring-damper with a little pre-tension (optionally
+tension-only, like a cable). The carriages follow prescribed trajectories;
+a fixed-step RK4 integrator advances all trajectories of a batch together,
+so a few hundred candidate motions are simulated in one pass and can be
+ranked on tracking error and residual vibration.
+
+Geometry (poses, carriage positions) is in the units of
+``square_kinematics``; ``LENGTH_UNIT`` converts it to metres so the physical
+parameters stay in SI.
+"""
+import numpy as np
+
+import square_kinematics
+from statics import MASS, INERTIA
+from square_kinematics import FRAME_SIZE, LINK_LENGTH, SQUARE_SIZE, LENGTH_UNIT
+
+DT = 1e-3           # s, integration step
+SETTLE_TIME = 0.5   # s, hold after the motion to measure residual vibration
+SETTLE_TOL = 0.05   # geometry units, band that counts as settled
+
+PARAMS = {
+    "mass": MASS,        # kg
+    "inertia": INERTIA,  # kg m^2, about the centre of the square
+    "stiffness": 2e4,    # N/m, axial stiffness per link
+    "damping": 5.0,      # N s/m, axial damping per link
+    "pretension": 20.0,  # N per link at the commanded pose
+    "gravity": 9.81,     # m/s^2, along -y
+    "cable": True,       # links can only pull
+}
+
+METRICS_DTYPE = np.dtype([
+    ("rms_error", "f8"),       # RMS position tracking error during the motion
+    ("max_error", "f8"),       # peak position tracking error during the motion
+    ("max_angle_error", "f8"),  # peak angle tracking error (rad)
+    ("residual", "f8"),        # peak deviation from the final rest pose after the motion
+    ("settling_time", "f8"),   # s after motion end until it stays within SETTLE_TOL
+    ("min_tension", "f8"),     # N, lowest link tension seen (0 = a link went slack)
+])
+
+
+# === Motion profiles: normalised progress s(tau), tau in [0, 1] ===
+def linear_profile(tau):
+    return np.clip(tau, 0, 1)
+
+
+def trapezoidal_profile(tau, accel_fraction=0.25):
+    """Constant acceleration, cruise, constant deceleration."""
+    tau = np.clip(tau, 0, 1)
+    a = accel_fraction
+    v = 1 / (1 - a)  # cruise speed so that s(1) = 1
+    return np.where(tau < a, v * tau**2 / (2 * a),
+                    np.where(tau <= 1 - a, v * (tau - a / 2),
+                             1 - v * (1 - tau)**2 / (2 * a)))
+
+
+def quintic_profile(tau):
+    """Minimum-jerk: zero velocity and acceleration at both ends."""
+    tau = np.clip(tau, 0, 1)
+    return 10 * tau**3 - 15 * tau**4 + 6 * tau**5
+
+
+PROFILES = {
+    "linear": linear_profile,
+    "trapezoidal": trapezoidal_profile,
+    "quintic": quintic_profile,
+}
+
+
+def pose_motion(start, end, duration, dt=DT, profile="quintic", settle=SETTLE_TIME,
+                link_length=LINK_LENGTH, frame_size=FRAME_SIZE, square_size=SQUARE_SIZE):
+    """Carriage trajectory for a straight pose move ``start`` -> ``end`` (cx, cy, theta).
+
+    Returns ``(ys, poses, n_move)``: carriage positions ``(n, 4)``, the
+    commanded poses ``(n, 3)`` and the number of steps before the hold.
+    Raises ValueError if the move leaves the reachable poses.
+    """
+    n_move = int(round(duration / dt)) + 1
+    n_total = n_move + int(round(settle / dt))
+    tau = np.minimum(np.arange(n_total) / (n_move - 1), 1.0)
+    s = PROFILES[profile](tau)[:, None]
+    start = np.asarray(start, dtype=float)
+    poses = start + s * (np.asarray(end, dtype=float) - start)
+    ys = square_kinematics.square_ik(poses[:, 0], poses[:, 1], poses[:, 2],
+                                     link_length, frame_size, square_size)
+    unreachable = ~np.all(np.isfinite(ys), axis=-1)
+    if unreachable.any():
+        first = int(np.argmax(unreachable))
+        raise ValueError(f"Pose {np.round(poses[first], 3).tolist()} at step {first} of the move "
+                         f"{start.tolist()} -> {list(end)} is not reachable")
+    return ys, poses, n_move
+
+
+def motion_batch(start, end, durations, profiles, dt=DT, settle=SETTLE_TIME, **geometry):
+    """Stack pose moves with different durations/profiles into one padded batch.
+
+    Every combination of ``durations`` x ``profiles`` becomes one trajectory;
+    shorter ones hold their final pose. Returns ``(ys, poses, n_move, labels)``.
+    """
+    runs = [(d, p) + pose_motion(start, end, d, dt, p, settle, **geometry)
+            for d in durations for p in profiles]
+    n = max(len(run[2]) for run in runs)
+    ys = np.stack([np.concatenate([r[2], np.repeat(r[2][-1:], n - len(r[2]), axis=0)]) for r in runs])
+    poses = np.stack([np.concatenate([r[3], np.repeat(r[3][-1:], n - len(r[3]), axis=0)]) for r in runs])
+    n_move = np.array([r[4] for r in runs])
+    labels = [f"{p} {d:g}s" for d, p, *_ in runs]
+    return ys, poses, n_move, labels
+
+
+# === Equations of motion (SI) ===
+def _accelerations(pose, vel, ys, vys, params, frame_size, square_size, rest_length):
+    """Platform accelerations and link tensions for a batch of states."""
+    corners = square_kinematics.square_corners(pose[:, 0], pose[:, 1], pose[:, 2], square_size)
+    arm = corners - pose[:, None, :2]
+    d = corners - np.stack(np.broadcast_arrays(square_kinematics.rail_x(frame_size), ys), axis=-1)
+    length = np.linalg.norm(d, axis=-1)
+    u = d / length[..., None]
+
+    omega = vel[:, 2:3]
+    corner_vel = np.stack([vel[:, 0:1] - omega * arm[..., 1],
+                           vel[:, 1:2] + omega * arm[..., 0] - vys], axis=-1)
+    stretch_rate = np.sum(u * corner_vel, axis=-1)
+    tension = params["stiffness"] * (length - rest_length) + params["damping"] * stretch_rate
+    if params["cable"]:
+        tension = np.maximum(tension, 0.0)
+
+    force = -tension[..., None] * u
+    moment = np.sum(arm[..., 0] * force[..., 1] - arm[..., 1] * force[..., 0], axis=-1)
+    acc = np.empty_like(pose)
+    acc[:, :2] = force.sum(axis=1) / params["mass"]
+    acc[:, 1] -= params["gravity"]
+    acc[:, 2] = moment / params["inertia"]
+    return acc, tension
+
+
+def _si_geometry(link_length, frame_size, square_size, params):
+    rest = link_length * LENGTH_UNIT - params["pretension"] / params["stiffness"]
+    return frame_size * LENGTH_UNIT, square_size * LENGTH_UNIT, rest
+
+
+def _to_si(pose):
+    pose = np.array(pose, dtype=float)
+    pose[..., :2] *= LENGTH_UNIT
+    return pose
+
+
+def _from_si(pose):
+    pose = np.array(pose, dtype=float)
+    pose[..., :2] /= LENGTH_UNIT
+    return pose
+
+
+def static_equilibrium(ys, guess=None, params=PARAMS, iterations=20,
+                       link_length=LINK_LENGTH, frame_size=FRAME_SIZE, square_size=SQUARE_SIZE):
+    """Rest pose under gravity for carriage positions ``ys`` ``(n, 4)``; Newton on the net wrench."""
+    ys = np.asarray(ys, dtype=float)
+    if guess is None:
+        guess = square_kinematics.square_fk(ys, link_length=link_length, frame_size=frame_size,
+                                            square_size=square_size)[0]
+    frame_si, square_si, rest = _si_geometry(link_length, frame_size, square_size, params)
+    pose = _to_si(guess)
+    ys_si = ys * LENGTH_UNIT
+    zero = np.zeros_like(pose)
+    steps = np.array([1e-7, 1e-7, 1e-6])
+
+    for _ in range(iterations):
+        f0 = _accelerations(pose, zero, ys_si, 0.0, params, frame_si, square_si, rest)[0]
+        J = np.empty(pose.shape + (3,))
+        for k in range(3):
+            shifted = pose.copy()
+            shifted[:, k] += steps[k]
+            J[..., k] = (_accelerations(shifted, zero, ys_si, 0.0, params, frame_si, square_si, rest)[0]
+                         - f0) / steps[k]
+        pose = pose - np.linalg.solve(J - 1e-9 * np.eye(3), f0[..., None])[..., 0]
+    return _from_si(pose)
+
+
+# === Integration ===
+def simulate(ys, dt=DT, params=PARAMS, initial_pose=None,
+             link_length=LINK_LENGTH, frame_size=FRAME_SIZE, square_size=SQUARE_SIZE):
+    """Integrate a batch of prescribed carriage trajectories ``ys`` ``(n_traj, n_steps, 4)``.
+
+    Starts each trajectory at rest in static equilibrium (unless
+    ``initial_pose`` is given). Returns ``(poses, tensions)`` with shapes
+    ``(n_traj, n_steps, 3)`` and ``(n_traj, n_steps, 4)``.
+    """
+    ys = np.asarray(ys, dtype=float)
+    n_traj, n_steps, _ = ys.shape
+    frame_si, square_si, rest = _si_geometry(link_length, frame_size, square_size, params)
+    ys_si = ys * LENGTH_UNIT
+    vys_si = np.gradient(ys_si, dt, axis=1) if n_steps > 1 else np.zeros_like(ys_si)
+
+    if initial_pose is None:
+        initial_pose = static_equilibrium(ys[:, 0], params=params, link_length=link_length,
+                                          frame_size=frame_size, square_size=square_size)
+    pose = _to_si(initial_pose)
+    vel = np.zeros_like(pose)
+
+    poses = np.empty((n_traj, n_steps, 3))
+    tensions = np.empty((n_traj, n_steps, 4))
+
+    def f(p, v, y, vy):
+        return _accelerations(p, v, y, vy, params, frame_si, square_si, rest)
+
+    for i in range(n_steps):
+        y0, vy0 = ys_si[:, i], vys_si[:, i]
+        a1, tension = f(pose, vel, y0, vy0)
+        poses[:, i] = pose
+        tensions[:, i] = tension
+        if i == n_steps - 1:
+            break
+        y1, vy1 = ys_si[:, i + 1], vys_si[:, i + 1]
+        ym, vym = (y0 + y1) / 2, (vy0 + vy1) / 2
+        a2 = f(pose + dt / 2 * vel, vel + dt / 2 * a1, ym, vym)[0]
+        a3 = f(pose + dt / 2 * (vel + dt / 2 * a1), vel + dt / 2 * a2, ym, vym)[0]
+        a4 = f(pose + dt * (vel + dt / 2 * a2), vel + dt * a3, y1, vy1)[0]
+        pose = pose + dt * vel + dt**2 / 6 * (a1 + a2 + a3)
+        vel = vel + dt / 6 * (a1 + 2 * a2 + 2 * a3 + a4)
+
+    return _from_si(poses), tensions
+
+
+# === Evaluation ===
+def evaluate(ys, reference, n_move, dt=DT, params=PARAMS, settle_tol=SETTLE_TOL, **geometry):
+    """Simulate a batch and score it.
+
+    ``reference`` are the commanded poses ``(n_traj, n_steps, 3)`` and
+    ``n_move`` the step where each motion ends. Returns ``(metrics, poses)``
+    with one METRICS_DTYPE record per trajectory.
+    """
+    ys = np.asarray(ys, dtype=float)
+    if not np.all(np.isfinite(ys)):
+        raise ValueError("Carriage trajectories contain non-finite values (unreachable poses)")
+    n_move = np.broadcast_to(n_move, len(ys))
+    poses, tensions = simulate(ys, dt, params, **geometry)
+    rest = static_equilibrium(ys[:, -1], poses[:, -1], params, **geometry)
+
+    steps = np.arange(ys.shape[1])
+    moving = steps[None, :] < n_move[:, None]
+    error = np.linalg.norm(poses[..., :2] - reference[..., :2], axis=-1)
+    angle_error = np.abs(poses[..., 2] - reference[..., 2])
+    deviation = np.linalg.norm(poses[..., :2] - rest[:, None, :2], axis=-1)
+    after = ~moving
+
+    metrics = np.zeros(len(ys), dtype=METRICS_DTYPE)
+    metrics["rms_error"] = np.sqrt(np.sum(np.where(moving, error**2, 0), axis=1) / n_move)
+    metrics["max_error"] = np.max(np.where(moving, error, 0), axis=1)
+    metrics["max_angle_error"] = np.max(np.where(moving, angle_error, 0), axis=1)
+    metrics["residual"] = np.max(np.where(after, deviation, 0), axis=1)
+
+    outside = after & (deviation > settle_tol)
+    last_outside = np.where(outside.any(axis=1), ys.shape[1] - 1 - np.argmax(outside[:, ::-1], axis=1), n_move - 1)
+    metrics["settling_time"] = (last_outside + 1 - n_move) * dt
+    unsettled = outside[:, -1]
+    metrics["settling_time"][unsettled] = np.inf
+    metrics["min_tension"] = tensions.min(axis=(1, 2))
+    return metrics, poses
+
+
+def rank(metrics, key="residual"):
+    """Trajectory indices from best to worst on ``key`` (lower is better)."""
+    return np.argsort(metrics[key], kind="stable")
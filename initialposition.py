@@ -1,5 +1,3 @@
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 import numpy as np
 
 # === Parameters ===
@@ -32,31 +30,39 @@ carriage_positions = {
     "CAR4": np.array([right_x, square_corners[3,1] + np.sqrt(LINK_LENGTH**2 - (right_x - square_corners[3,0])**2)]),
 }
 
-# === Plotting ===
-fig, ax = plt.subplots()
-ax.set_xlim(-HALF_FRAME, HALF_FRAME)
-ax.set_ylim(-HALF_FRAME, HALF_FRAME)
-ax.set_aspect('equal')
-ax.grid(True)
-ax.axhline(0, color='black', lw=0.5)
-ax.axvline(0, color='black', lw=0.5)
-
-# Draw vertical rails
-ax.plot([left_x, left_x], [-HALF_FRAME, HALF_FRAME], 'gray', linestyle='--')
-ax.plot([right_x, right_x], [-HALF_FRAME, HALF_FRAME], 'gray', linestyle='--')
-
-# Draw carriages
-for name, pos in carriage_positions.items():
-    ax.plot(*pos, 'ro')
-    ax.text(pos[0] + (0.5 if pos[0] < 0 else -2.0), pos[1] + 1.5, name, fontsize=9, color='darkred')
-
-# Draw links
-for carriage_pos, corner_pos in zip(carriage_positions.values(), square_corners):
-    ax.plot([carriage_pos[0], corner_pos[0]], [carriage_pos[1], corner_pos[1]], 'k--')
-
-# Draw square
-square_patch = patches.Polygon(square_corners, closed=True, edgecolor='blue', facecolor='lightblue', linewidth=2)
-ax.add_patch(square_patch)
-
-plt.title(f"Centered Upright Square (size={SQUARE_SIZE}) with Links (L={LINK_LENGTH})")
-plt.show()
+def main():
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as patches
+
+    # === Plotting ===
+    fig, ax = plt.subplots()
+    ax.set_xlim(-HALF_FRAME, HALF_FRAME)
+    ax.set_ylim(-HALF_FRAME, HALF_FRAME)
+    ax.set_aspect('equal')
+    ax.grid(True)
+    ax.axhline(0, color='black', lw=0.5)
+    ax.axvline(0, color='black', lw=0.5)
+
+    # Draw vertical rails
+    ax.plot([left_x, left_x], [-HALF_FRAME, HALF_FRAME], 'gray', linestyle='--')
+    ax.plot([right_x, right_x], [-HALF_FRAME, HALF_FRAME], 'gray', linestyle='--')
+
+    # Draw carriages
+    for name, pos in carriage_positions.items():
+        ax.plot(*pos, 'ro')
+        ax.text(pos[0] + (0.5 if pos[0] < 0 else -2.0), pos[1] + 1.5, name, fontsize=9, color='darkred')
+
+    # Draw links
+    for carriage_pos, corner_pos in zip(carriage_positions.values(), square_corners):
+        ax.plot([carriage_pos[0], corner_pos[0]], [carriage_pos[1], corner_pos[1]], 'k--')
+
+    # Draw square
+    square_patch = patches.Polygon(square_corners, closed=True, edgecolor='blue', facecolor='lightblue', linewidth=2)
+    ax.add_patch(square_patch)
+
+    plt.title(f"Centered Upright Square (size={SQUARE_SIZE}) with Links (L={LINK_LENGTH})")
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Batched kinematics of the cable-driven point P.
+
+Vectorised version of ``plot_y_crosses`` in ``simulation_base``: every
+function accepts scalars or arrays for ``x_P``/``y_P`` and broadcasts them,
+so a single point, a trajectory or a whole workspace grid go through the
+same code path. Geometry (``B``, ``H``) broadcasts against the sample shape
+and ``l`` against the per-cable axis, so perturbed machines can be batched too.
+"""
+import numpy as np
+
+# Constantes
+H = 100  # Hoogte
+B = 56   # Breedte
+l = 100  # Kabellengte
+ROLLER_GAP = 10  # |y1| + |y2| at which the rollers touch
+
+# === Constraint status codes (same order as plot_y_crosses checks them) ===
+IN_BOUNDS = 0
+LINK_TOO_SHORT = 1
+Y_MAX_REACHED = 2
+ROLLERS_TOUCH = 3
+
+# Constraint names, as used by constraint_masks and workspace_maps
+CONSTRAINTS = ("cable", "y_max", "rollers")
+
+STATUS_MESSAGES = {
+    IN_BOUNDS: "In bounds",
+    LINK_TOO_SHORT: "This point is out of bounds (l is too short)",
+    Y_MAX_REACHED: "This point is out of bounds (y_max reached)",
+    ROLLERS_TOUCH: "This point is out of bounds (the rollers touch)",
+}
+
+
+# Sign pattern of corners/rails 1..4 in x and y
+CORNER_X_SIGN = np.array([-1.0, -1.0, 1.0, 1.0])
+CORNER_Y_SIGN = np.array([1.0, -1.0, -1.0, 1.0])
+
+# dy_i/dd_i: the top carriages rise when their cable gets longer, the bottom ones drop
+CARRIAGE_SIGN = CORNER_Y_SIGN
+
+
+def corners(B=B, H=H):
+    """Frame corners 1..4: top-left, bottom-left, bottom-right, top-right."""
+    half_b = np.asarray(B, dtype=float)[..., None] / 2
+    half_h = np.asarray(H, dtype=float)[..., None] / 2
+    half_b, half_h = np.broadcast_arrays(half_b, half_h)
+    return np.stack([CORNER_X_SIGN * half_b, CORNER_Y_SIGN * half_h], axis=-1)
+
+
+def rail_x(B=B):
+    """X-position of the rail each carriage 1..4 runs on."""
+    return CORNER_X_SIGN * np.asarray(B, dtype=float)[..., None] / 2
+
+
+def cable_lengths(x_P, y_P, B=B, H=H):
+    """Distance d1..d4 from P to each corner, stacked along the last axis."""
+    x_P = np.asarray(x_P, dtype=float)
+    y_P = np.asarray(y_P, dtype=float)
+    left = B / 2 + x_P
+    right = B / 2 - x_P
+    top = H / 2 - y_P
+    bottom = H / 2 + y_P
+    return np.stack([
+        np.hypot(left, top),
+        np.hypot(left, bottom),
+        np.hypot(right, bottom),
+        np.hypot(right, top),
+    ], axis=-1)
+
+
+def carriage_heights(ds, H=H, l=l):
+    """Carriage positions y1..y4 for the corner distances ``ds``."""
+    half_h = np.asarray(H, dtype=float)[..., None] / 2
+    return CARRIAGE_SIGN * (np.asarray(ds, dtype=float) - l + half_h)
+
+
+def free_lengths(ys, H=H, l=l):
+    """Cable length d1..d4 between corner and P for carriage positions ``ys``."""
+    half_h = np.asarray(H, dtype=float)[..., None] / 2
+    return CARRIAGE_SIGN * np.asarray(ys, dtype=float) + l - half_h
+
+
+def point_ik(x_P, y_P, B=B, H=H, l=l):
+    """Return ``(ys, ds)``: carriage positions y1..y4 and corner distances d1..d4."""
+    ds = cable_lengths(x_P, y_P, B, H)
+    return carriage_heights(ds, H, l), ds
+
+
+def cable_directions(x_P, y_P, B=B, H=H):
+    """Unit vectors from each corner towards P, shape ``(..., 4, 2)``, and d1..d4."""
+    P = np.stack(np.broadcast_arrays(np.asarray(x_P, dtype=float),
+                                     np.asarray(y_P, dtype=float)), axis=-1)
+    rel = P[..., None, :] - corners(B, H)
+    ds = np.sqrt(np.sum(rel**2, axis=-1))
+    return rel / ds[..., None], ds
+
+
+def point_jacobian(x_P, y_P, B=B, H=H):
+    """Jacobian dy_i/dP of the carriage positions, shape ``(..., 4, 2)``."""
+    units, _ = cable_directions(x_P, y_P, B, H)
+    return CARRIAGE_SIGN[:, None] * units
+
+
+def carriage_rates(x_P, y_P, vx, vy, ax, ay, B=B, H=H):
+    """Carriage velocities and accelerations for P moving with (vx, vy), (ax, ay).
+
+    Uses the exact second-order expansion of d = |P - c|:
+    d'' = u . P'' + (|P'|^2 - (u . P')^2) / d.
+    """
+    units, ds = cable_directions(x_P, y_P, B, H)
+    v = np.stack(np.broadcast_arrays(np.asarray(vx, dtype=float),
+                                     np.asarray(vy, dtype=float)), axis=-1)[..., None, :]
+    a = np.stack(np.broadcast_arrays(np.asarray(ax, dtype=float),
+                                     np.asarray(ay, dtype=float)), axis=-1)[..., None, :]
+    u_v = np.sum(units * v, axis=-1)
+    d_dot = u_v
+    d_ddot = np.sum(units * a, axis=-1) + (np.sum(v * v, axis=-1) - u_v**2) / ds
+    return CARRIAGE_SIGN * d_dot, CARRIAGE_SIGN * d_ddot
+
+
+def point_fk(ys, B=B, H=H, l=l, iterations=3):
+    """Position of P for carriage positions ``ys`` (shape ``(..., 4)``).
+
+    The four cable circles are intersected in closed form by subtracting the
+    first circle equation from the others (a linear least-squares problem in
+    P), then polished with a few Gauss-Newton steps on the true length
+    residuals, which matters when the geometry is inconsistent. Returns
+    ``(P, residuals)`` with P shape ``(..., 2)``.
+    """
+    ds = free_lengths(ys, H, l)
+    cs = corners(B, H)
+    A = 2 * (cs[..., 1:, :] - cs[..., :1, :])
+    rhs = (np.sum(cs[..., 1:, :]**2, axis=-1) - np.sum(cs[..., :1, :]**2, axis=-1)
+           - ds[..., 1:]**2 + ds[..., :1]**2)
+    P = _solve_normal(A, rhs)
+
+    for _ in range(iterations):
+        rel = P[..., None, :] - cs
+        dist = np.sqrt(np.sum(rel**2, axis=-1))
+        P = P - _solve_normal(rel / dist[..., None], dist - ds)
+
+    residuals = np.sqrt(np.sum((P[..., None, :] - cs)**2, axis=-1)) - ds
+    return P, residuals
+
+
+def _solve_normal(A, b):
+    """Batched least squares for ``(..., n, 2)`` systems via the 2x2 normal equations."""
+    a11 = np.sum(A[..., 0]**2, axis=-1)
+    a12 = np.sum(A[..., 0] * A[..., 1], axis=-1)
+    a22 = np.sum(A[..., 1]**2, axis=-1)
+    b1 = np.sum(A[..., 0] * b, axis=-1)
+    b2 = np.sum(A[..., 1] * b, axis=-1)
+    det = a11 * a22 - a12**2
+    return np.stack([(a22 * b1 - a12 * b2) / det, (a11 * b2 - a12 * b1) / det], axis=-1)
+
+
+def constraint_masks(ds, H=H, l=l, gap=ROLLER_GAP, ys=None, constraints=CONSTRAINTS):
+    """Per-sample pass masks ``{name: bool array}`` for the named ``constraints``.
+
+    The single definition of the plot_y_crosses checks: cables long enough
+    (``d_i < l``), carriages within ``+-H/2`` and rollers apart. ``|y_i|``
+    is ``|d_i - l + H/2|`` unless the carriage positions ``ys`` are given.
+    """
+    ds = np.asarray(ds)
+    half_h = np.asarray(H, dtype=float)[..., None] / 2
+    a = np.abs(ds - l + half_h) if ys is None else np.abs(ys)
+    masks = {}
+    if "cable" in constraints:
+        masks["cable"] = np.all(ds < l, axis=-1)
+    if "y_max" in constraints:
+        masks["y_max"] = np.all(a <= half_h, axis=-1)
+    if "rollers" in constraints:
+        masks["rollers"] = (a[..., 0] + a[..., 1] > gap) & (a[..., 2] + a[..., 3] > gap)
+    return masks
+
+
+def constraint_status(ys, ds, H=H, l=l, gap=ROLLER_GAP):
+    """Status code per sample; the first failing check wins, as in plot_y_crosses."""
+    masks = constraint_masks(ds, H, l, gap, ys)
+    status = np.full(masks["cable"].shape, IN_BOUNDS, dtype=np.int8)
+    status[~masks["rollers"]] = ROLLERS_TOUCH
+    status[~masks["y_max"]] = Y_MAX_REACHED
+    status[~masks["cable"]] = LINK_TOO_SHORT
+    return status
+
+
+def in_workspace(x_P, y_P, B=B, H=H, l=l, gap=ROLLER_GAP):
+    """Boolean mask of the points that pass every constraint."""
+    ys, ds = point_ik(x_P, y_P, B, H, l)
+    return constraint_status(ys, ds, H, l, gap) == IN_BOUNDS
+
+
+def workspace_grid(B=B, H=H, l=l, gap=ROLLER_GAP, resolution=500):
+    """Sample the frame on a regular grid; returns ``(xs, ys, mask)``.
+
+    ``mask`` has shape ``(len(ys), len(xs))`` (row = y), ready for ``imshow``
+    with ``origin='lower'``. The grid is built by broadcasting, no meshgrid.
+    """
+    xs = np.linspace(-B / 2, B / 2, resolution)
+    ys = np.linspace(-H / 2, H / 2, resolution)
+    mask = in_workspace(xs[None, :], ys[:, None], B, H, l, gap)
+    return xs, ys, mask
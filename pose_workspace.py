@@ -0,0 +1,184 @@
+"""Reachable pose volume (cx, cy, theta) of the square platform.
+
+A pose is reachable when ``square_ik`` has a real solution for all four
+links, every carriage stays within ``±HALF_FRAME`` on its rail and the
+square's corners stay between the rails. The pose box is sampled on a
+regular grid, a block of orientations at a time, and the result is kept as a
+bit-packed voxel grid (one bit per pose, packed along cx), so a
+200 x 200 x 91 volume takes under half a megabyte.
+
+From the voxel grid:
+
+* ``slice(theta)`` / ``constant_orientation(theta)``: positions reachable
+  at one fixed orientation;
+* ``total_orientation(theta_min, theta_max)``: positions reachable with
+  *every* orientation in the range (bitwise AND over the theta slices);
+* ``maximal()``: positions reachable with *some* orientation (bitwise OR).
+"""
+import numpy as np
+
+import square_kinematics
+from square_kinematics import FRAME_SIZE, LINK_LENGTH, SQUARE_SIZE
+
+RESOLUTION = 200           # grid points across the frame along cx and cy
+THETA_STEPS = 91
+THETA_RANGE = np.pi / 4    # theta sampled in [-THETA_RANGE, THETA_RANGE]
+CHUNK_ELEMENTS = 4_000_000  # poses evaluated per block
+
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:
+    _POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(bits):
+        return _POPCOUNT[bits]
+
+
+class PoseVolume:
+    """Bit-packed reachable set on the grid ``thetas x cys x cxs``."""
+
+    def __init__(self, cxs, cys, thetas, packed):
+        self.cxs, self.cys, self.thetas = cxs, cys, thetas
+        self.packed = packed  # uint8, shape (n_theta, n_cy, ceil(n_cx / 8))
+
+    @property
+    def shape(self):
+        return len(self.thetas), len(self.cys), len(self.cxs)
+
+    def _unpack(self, packed):
+        return np.unpackbits(packed, axis=-1, count=len(self.cxs)).astype(bool)
+
+    def theta_index(self, theta):
+        return int(np.argmin(np.abs(self.thetas - theta)))
+
+    # === Workspaces ===
+    def slice(self, theta):
+        """Reachable (cy, cx) mask at the sampled orientation nearest ``theta``."""
+        return self._unpack(self.packed[self.theta_index(theta)])
+
+    constant_orientation = slice
+
+    def total_orientation(self, theta_min=None, theta_max=None):
+        """Positions reachable with every sampled orientation in ``[theta_min, theta_max]``."""
+        return self._unpack(np.bitwise_and.reduce(self.packed[self._theta_range(theta_min, theta_max)], axis=0))
+
+    def maximal(self, theta_min=None, theta_max=None):
+        """Positions reachable with at least one sampled orientation in the range."""
+        return self._unpack(np.bitwise_or.reduce(self.packed[self._theta_range(theta_min, theta_max)], axis=0))
+
+    def _theta_range(self, theta_min, theta_max):
+        lo = self.thetas[0] if theta_min is None else theta_min
+        hi = self.thetas[-1] if theta_max is None else theta_max
+        selected = (self.thetas >= lo - 1e-12) & (self.thetas <= hi + 1e-12)
+        if not selected.any():
+            raise ValueError(f"No sampled orientation in [{lo}, {hi}]")
+        return selected
+
+    def to_dense(self):
+        return self._unpack(self.packed)
+
+    def orientation_range(self):
+        """Per position, the number of reachable orientation samples, shape ``(n_cy, n_cx)``."""
+        counts = np.zeros(self.shape[1:], dtype=np.int32)
+        for k in range(len(self.thetas)):
+            counts += self._unpack(self.packed[k])
+        return counts
+
+    # === Sizes ===
+    def cell_area(self):
+        return (self.cxs[1] - self.cxs[0]) * (self.cys[1] - self.cys[0])
+
+    def area(self, mask):
+        """Area of a (cy, cx) mask in units^2."""
+        return np.count_nonzero(mask) * self.cell_area()
+
+    def fraction(self):
+        """Fraction of all sampled poses that is reachable (popcount, no unpacking)."""
+        ones = sum(int(_popcount(self.packed[k]).sum(dtype=np.int64)) for k in range(len(self.thetas)))
+        return ones / np.prod(self.shape)
+
+    # === Storage ===
+    def save(self, path):
+        np.savez_compressed(path, cxs=self.cxs, cys=self.cys, thetas=self.thetas, packed=self.packed)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["cxs"], data["cys"], data["thetas"], data["packed"])
+
+
+def reachable(cx, cy, theta, link_length=LINK_LENGTH, frame_size=FRAME_SIZE, square_size=SQUARE_SIZE):
+    """True where the pose can be reached; the arguments broadcast."""
+    half = np.asarray(frame_size, dtype=float) / 2
+    ys = square_kinematics.square_ik(cx, cy, theta, link_length, frame_size, square_size)
+    corners = square_kinematics.square_corners(cx, cy, theta, square_size)
+    with np.errstate(invalid="ignore"):
+        on_rail = np.all(np.abs(ys) <= half[..., None], axis=-1)
+    inside = np.all(np.abs(corners[..., 0]) < half[..., None], axis=-1)
+    return on_rail & inside
+
+
+def reachable_extent(thetas, link_length=LINK_LENGTH, frame_size=FRAME_SIZE, square_size=SQUARE_SIZE,
+                     samples=1001):
+    """Box ``(cx_min, cx_max, cy_min, cy_max)`` holding every reachable pose at ``thetas``.
+
+    A left corner sits at most ``h (sin|theta| - cos theta)`` right of the
+    centre, so the links reach their rails only for ``|cx| <= L - F/2 -``
+    that offset. The carriage heights are ``cy + square_ik(cx, 0, theta)``,
+    so for every cx the rail limits bound cy to an interval in closed form;
+    only cx is sampled. Returns None if nothing is reachable.
+    """
+    thetas = np.atleast_1d(np.asarray(thetas, dtype=float))
+    half = frame_size / 2
+    t = min(float(np.min(np.abs(thetas))), 3 * np.pi / 4)
+    band = min(link_length - half - square_size / 2 * (np.sin(t) - np.cos(t)), half)
+    if band < 0:
+        return None
+    cx = np.linspace(-band, band, samples)
+    offsets = square_kinematics.square_ik(cx[None, :], 0.0, thetas[:, None],
+                                          link_length, frame_size, square_size)
+    corners = square_kinematics.square_corners(cx[None, :], 0.0, thetas[:, None], square_size)
+    lo = np.max(-half - offsets, axis=-1)  # NaN where a link cannot reach its rail
+    hi = np.min(half - offsets, axis=-1)
+    ok = (lo <= hi) & np.all(np.abs(corners[..., 0]) < half, axis=-1)
+    if not ok.any():
+        return None
+
+    # Pad by one sample: the edges may fall between the sampled cx
+    step = cx[1] - cx[0]
+    lo, hi = np.where(ok, lo, np.nan), np.where(ok, hi, np.nan)
+    pad = np.nan_to_num(np.nanmax(np.abs(np.diff(np.stack([lo, hi]), axis=-1)), initial=0.0))
+    xs = np.broadcast_to(cx, ok.shape)[ok]
+    return (max(xs.min() - step, -band), min(xs.max() + step, band),
+            max(np.nanmin(lo) - pad, -half), min(np.nanmax(hi) + pad, half))
+
+
+def _clip(grid, lo, hi):
+    """The points of ``grid`` in ``[lo, hi]``, at least two so the cell size stays defined."""
+    start = int(np.searchsorted(grid, lo))
+    stop = max(int(np.searchsorted(grid, hi, side="right")), min(start + 2, len(grid)))
+    return grid[min(start, stop - 2):stop]
+
+
+def reachable_volume(resolution=RESOLUTION, theta_steps=THETA_STEPS, theta_range=THETA_RANGE,
+                     link_length=LINK_LENGTH, frame_size=FRAME_SIZE, square_size=SQUARE_SIZE,
+                     chunk_elements=CHUNK_ELEMENTS):
+    """Sample the pose box and return the reachable set as a PoseVolume.
+
+    ``resolution`` grid points span the frame along cx and cy; only the ones
+    inside ``reachable_extent`` are evaluated and stored.
+    """
+    half = frame_size / 2
+    grid = np.linspace(-half, half, resolution)
+    thetas = np.linspace(-theta_range, theta_range, theta_steps)
+    extent = reachable_extent(thetas, link_length, frame_size, square_size)
+    x0, x1, y0, y1 = (-half, half, -half, half) if extent is None else extent
+    cxs, cys = _clip(grid, x0, x1), _clip(grid, y0, y1)
+    packed = np.empty((theta_steps, len(cys), (len(cxs) + 7) // 8), dtype=np.uint8)
+
+    block = max(1, int(chunk_elements // (len(cxs) * len(cys))))
+    for start in range(0, theta_steps, block):
+        th = thetas[start:start + block, None, None]
+        mask = reachable(cxs[None, None, :], cys[None, :, None], th, link_length, frame_size, square_size)
+        packed[start:start + block] = np.packbits(mask, axis=-1)
+    return PoseVolume(cxs, cys, thetas, packed)
@@ -1,5 +1,3 @@
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 import numpy as np
 
 # === Frame Settings ===
@@ -55,43 +53,54 @@ def total_link_error(center, angle_rad):
     return error
 
 # Brute-force search for a good rotation angle (fast enough for one frame)
-angles = np.linspace(0, 2 * np.pi, 360)
-best_error = float('inf')
-best_angle = 0
-for angle in angles:
-    err = total_link_error(square_center, angle)
-    if err < best_error:
-        best_error = err
-        best_angle = angle
-
-# Final square corners
-square_corners = rotated_corners(square_center, best_angle)
-
-# === Plot ===
-fig, ax = plt.subplots()
-ax.set_xlim(-half_frame, half_frame)
-ax.set_ylim(-half_frame, half_frame)
-ax.set_aspect('equal')
-ax.grid(True)
-ax.axhline(0, color='black', lw=0.5)
-ax.axvline(0, color='black', lw=0.5)
-
-# Draw rails
-ax.plot([left_x, left_x], [-half_frame, half_frame], 'gray', linestyle='--')
-ax.plot([right_x, right_x], [-half_frame, half_frame], 'gray', linestyle='--')
-
-# Draw carriages
-for name, pos in carriages.items():
-    ax.plot(*pos, 'ro')
-    ax.text(pos[0] + (0.5 if pos[0] < 0 else -2.0), pos[1] + 1.5, name, fontsize=9, color='darkred')
-
-# Draw links (from carriages to corners)
-for carriage_pos, corner_pos in zip(carriages.values(), square_corners):
-    ax.plot([carriage_pos[0], corner_pos[0]], [carriage_pos[1], corner_pos[1]], 'k--')
-
-# Draw square
-square_patch = patches.Polygon(square_corners, closed=True, edgecolor='blue', facecolor='lightblue', linewidth=2)
-ax.add_patch(square_patch)
-
-plt.title("Movable Square with Fixed-Length Links (L=50)")
-plt.show()
+def best_rotation(center):
+    angles = np.linspace(0, 2 * np.pi, 360)
+    best_error = float('inf')
+    best_angle = 0
+    for angle in angles:
+        err = total_link_error(center, angle)
+        if err < best_error:
+            best_error = err
+            best_angle = angle
+    return best_angle
+
+
+def main():
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as patches
+
+    # Final square corners
+    square_corners = rotated_corners(square_center, best_rotation(square_center))
+
+    # === Plot ===
+    fig, ax = plt.subplots()
+    ax.set_xlim(-half_frame, half_frame)
+    ax.set_ylim(-half_frame, half_frame)
+    ax.set_aspect('equal')
+    ax.grid(True)
+    ax.axhline(0, color='black', lw=0.5)
+    ax.axvline(0, color='black', lw=0.5)
+
+    # Draw rails
+    ax.plot([left_x, left_x], [-half_frame, half_frame], 'gray', linestyle='--')
+    ax.plot([right_x, right_x], [-half_frame, half_frame], 'gray', linestyle='--')
+
+    # Draw carriages
+    for name, pos in carriages.items():
+        ax.plot(*pos, 'ro')
+        ax.text(pos[0] + (0.5 if pos[0] < 0 else -2.0), pos[1] + 1.5, name, fontsize=9, color='darkred')
+
+    # Draw links (from carriages to corners)
+    for carriage_pos, corner_pos in zip(carriages.values(), square_corners):
+        ax.plot([carriage_pos[0], corner_pos[0]], [carriage_pos[1], corner_pos[1]], 'k--')
+
+    # Draw square
+    square_patch = patches.Polygon(square_corners, closed=True, edgecolor='blue', facecolor='lightblue', linewidth=2)
+    ax.add_patch(square_patch)
+
+    plt.title("Movable Square with Fixed-Length Links (L=50)")
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Cached raster backgrounds for the plotting front ends.
+
+Static scenery (frame, rails, origin) and workspace overlays only depend on
+the geometry, so they are rendered once off-screen with Agg into an RGBA
+image, kept in memory and in ``CACHE_DIR`` on disk, and drawn with a single
+``imshow``. The front ends then only draw their moving parts on top; plot and
+resize time no longer depend on how finely the workspace was sampled.
+"""
+import hashlib
+import os
+
+import numpy as np
+
+import kinematics
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".render_cache")
+RENDER_VERSION = 1  # bump when the scenery drawing changes
+PIXELS = 1000       # raster size along the longest side
+PAD = 2             # margin around the frame so its border stays visible
+OVERLAY_RESOLUTION = 1000
+
+_memory_cache = {}
+
+
+def cached_raster(key, extent, draw, pixels=PIXELS, facecolor='black'):
+    """Return the RGBA raster for ``key``, calling ``draw(ax)`` only on a cache miss.
+
+    ``extent`` is ``(left, right, bottom, top)`` in data units; the image maps
+    onto it exactly, ready for ``imshow(img, extent=extent)``.
+    """
+    key = f"v{RENDER_VERSION}|{key}|{tuple(float(e) for e in extent)}|{pixels}|{facecolor}"
+    if key in _memory_cache:
+        return _memory_cache[key]
+
+    path = os.path.join(CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + ".npy")
+    try:
+        image = np.load(path)
+    except (OSError, ValueError):
+        image = _render(extent, draw, pixels, facecolor)
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            np.save(path, image)
+        except OSError:
+            pass  # read-only checkout: keep the in-memory copy only
+    _memory_cache[key] = image
+    return image
+
+
+def _render(extent, draw, pixels, facecolor):
+    """Draw into an off-screen Agg canvas that covers exactly ``extent``."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    left, right, bottom, top = extent
+    scale = pixels / max(right - left, top - bottom)
+    width, height = round((right - left) * scale), round((top - bottom) * scale)
+    fig = Figure(figsize=(width / 100, height / 100), dpi=100, facecolor=facecolor)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes((0, 0, 1, 1))
+    ax.set_axis_off()
+    ax.set_facecolor(facecolor)
+    draw(ax)
+    ax.set_xlim(left, right)
+    ax.set_ylim(bottom, top)
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba()).copy()
+
+
+def frame_extent(B=kinematics.B, H=kinematics.H, pad=PAD):
+    return (-B / 2 - pad, B / 2 + pad, -H / 2 - pad, H / 2 + pad)
+
+
+def draw_scenery(ax, B=kinematics.B, H=kinematics.H, l=kinematics.l, gap=kinematics.ROLLER_GAP,
+                 overlay=None, resolution=OVERLAY_RESOLUTION):
+    """Vector drawing of the static scenery; only called when a raster is (re)built.
+
+    ``overlay`` is None, ``"workspace"`` (reachable points shaded) or
+    ``"cable"`` (points where l is too short shaded, as sim_bc did).
+    """
+    from simulation_base import plot_frame, plot_side_axes, plot_origin
+
+    if overlay == "workspace":
+        _, _, mask = kinematics.workspace_grid(B, H, l, gap, resolution)
+        ax.imshow(mask, extent=(-B / 2, B / 2, -H / 2, H / 2), origin='lower',
+                  cmap='Greens', alpha=0.5, interpolation='nearest')
+    elif overlay == "cable":
+        xs = np.linspace(-B / 2, B / 2, resolution)
+        ys = np.linspace(-H / 2, H / 2, resolution)
+        ds = kinematics.cable_lengths(xs[None, :], ys[:, None], B, H)
+        ax.imshow(np.any(ds >= l, axis=-1), extent=(-B / 2, B / 2, -H / 2, H / 2), origin='lower',
+                  cmap='Greens', alpha=0.5, interpolation='nearest')
+    elif overlay is not None:
+        raise ValueError(f"Unknown overlay {overlay!r}")
+
+    plot_frame(ax, B, H)
+    plot_side_axes(ax, B, H)
+    plot_origin(ax)
+
+
+def background_image(B=kinematics.B, H=kinematics.H, l=kinematics.l, gap=kinematics.ROLLER_GAP,
+                     overlay=None, resolution=OVERLAY_RESOLUTION, pixels=PIXELS):
+    """Cached raster of the scenery (and overlay) for one geometry; returns ``(image, extent)``."""
+    extent = frame_extent(B, H)
+    key = f"scenery|{B}|{H}|{l}|{gap}|{overlay}|{resolution}"
+    image = cached_raster(key, extent,
+                          lambda ax: draw_scenery(ax, B, H, l, gap, overlay, resolution), pixels)
+    return image, extent
+
+
+def draw_background(ax, B=kinematics.B, H=kinematics.H, l=kinematics.l, gap=kinematics.ROLLER_GAP,
+                    overlay=None, resolution=OVERLAY_RESOLUTION, pixels=PIXELS):
+    """Put the cached background on ``ax`` as one image; returns the AxesImage."""
+    image, extent = background_image(B, H, l, gap, overlay, resolution, pixels)
+    return show_raster(ax, image, extent)
+
+
+def show_raster(ax, image, extent):
+    return ax.imshow(image, extent=extent, origin='upper', interpolation='nearest', zorder=0)
@@ -0,0 +1,140 @@
+"""Replay recorded carriage logs through the square-platform forward kinematics.
+
+A log (CSV with columns t, CAR1..CAR4, or a setpoint file from
+``setpoints.py`` written for the square model, i.e. with ``B = H =
+frame_size`` and ``l = link_length``) is streamed in fixed-size chunks.
+Each chunk is solved with the batched ``square_fk``, samples whose link
+residual or rail margin cross a threshold are flagged, and the result
+records are appended to the output file before the next chunk is read, so
+memory use does not depend on log length.
+"""
+import itertools
+
+import numpy as np
+
+from setpoints import MAGIC, SetpointReader
+from square_kinematics import (
+    FRAME_SIZE, LINK_LENGTH, SQUARE_SIZE,
+    square_fk, rail_margin,
+)
+
+CHUNK_SIZE = 100_000
+RESIDUAL_TOL = 0.05  # max |link length error| before a sample is flagged
+MARGIN_TOL = 1.0     # min distance to the rail ends before a sample is flagged
+
+# Flag bits in the result records
+FLAG_RESIDUAL = 1
+FLAG_MARGIN = 2
+FLAG_NO_SOLUTION = 4
+
+RESULT_DTYPE = np.dtype([
+    ("t", "<f8"),
+    ("cx", "<f8"),
+    ("cy", "<f8"),
+    ("theta", "<f8"),
+    ("residual", "<f4"),
+    ("margin", "<f4"),
+    ("flags", "u1"),
+])
+
+
+def is_setpoint_file(path):
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def iter_csv_chunks(path, chunk_size=CHUNK_SIZE, delimiter=",", columns=(0, 1, 2, 3, 4)):
+    """Yield ``(t, ys)`` chunks from a CSV log; a non-numeric first line is skipped."""
+    with open(path) as f:
+        first = f.readline()
+        lines = f if _is_header(first, delimiter) else itertools.chain([first], f)
+        while True:
+            block = list(itertools.islice(lines, chunk_size))
+            if not block:
+                return
+            data = np.loadtxt(block, delimiter=delimiter, usecols=columns, ndmin=2)
+            yield data[:, 0], data[:, 1:5]
+
+
+def _is_header(line, delimiter):
+    try:
+        [float(v) for v in line.split(delimiter)]
+    except ValueError:
+        return True
+    return False
+
+
+def iter_binary_chunks(path, chunk_size=CHUNK_SIZE, link_length=LINK_LENGTH, frame_size=FRAME_SIZE):
+    """Yield ``(t, ys)`` chunks from a setpoint file (memory-mapped).
+
+    The header geometry must describe the square model; cable-model files
+    (the default of ``setpoints.write_trajectory``) hold positions of a
+    different machine and are rejected.
+    """
+    reader = SetpointReader(path)
+    geometry = reader.geometry
+    B, H, l = geometry["B"], geometry["H"], geometry["l"]
+    if not np.allclose((B, H, l), (frame_size, frame_size, link_length)):
+        raise ValueError(f"{path} was written for B={B:g}, H={H:g}, l={l:g}, not for the square "
+                         f"model (frame {frame_size:g}, links {link_length:g})")
+    return ((np.asarray(records["t"]), np.asarray(records["pos"], dtype=float))
+            for records in reader.chunks(chunk_size))
+
+
+def iter_log_chunks(path, chunk_size=CHUNK_SIZE, link_length=LINK_LENGTH, frame_size=FRAME_SIZE,
+                    **csv_options):
+    if is_setpoint_file(path):
+        return iter_binary_chunks(path, chunk_size, link_length, frame_size)
+    return iter_csv_chunks(path, chunk_size, **csv_options)
+
+
+def replay_chunk(t, ys, guess=None, residual_tol=RESIDUAL_TOL, margin_tol=MARGIN_TOL,
+                 link_length=LINK_LENGTH, frame_size=FRAME_SIZE, square_size=SQUARE_SIZE):
+    """Solve one chunk and return its result records."""
+    pose, residuals = square_fk(ys, guess, link_length=link_length,
+                                frame_size=frame_size, square_size=square_size)
+    out = np.zeros(len(t), dtype=RESULT_DTYPE)
+    out["t"] = t
+    out["cx"], out["cy"], out["theta"] = pose[:, 0], pose[:, 1], pose[:, 2]
+    out["residual"] = np.max(np.abs(residuals), axis=-1)
+    out["margin"] = rail_margin(ys, frame_size)
+
+    flags = np.zeros(len(t), dtype=np.uint8)
+    with np.errstate(invalid="ignore"):
+        flags[out["residual"] > residual_tol] |= FLAG_RESIDUAL
+        flags[out["margin"] < margin_tol] |= FLAG_MARGIN
+    # Dropouts (NaN carriages) and unsolvable rows
+    no_solution = (~np.all(np.isfinite(ys), axis=-1) | ~np.all(np.isfinite(pose), axis=-1)
+                   | ~np.isfinite(out["residual"]))
+    flags[no_solution] |= FLAG_NO_SOLUTION
+    out["flags"] = flags
+    return out
+
+
+def replay(log_path, out_path, chunk_size=CHUNK_SIZE, residual_tol=RESIDUAL_TOL, margin_tol=MARGIN_TOL,
+           link_length=LINK_LENGTH, frame_size=FRAME_SIZE, square_size=SQUARE_SIZE, **csv_options):
+    """Replay ``log_path`` into ``out_path`` (raw RESULT_DTYPE records); returns a summary."""
+    chunks = iter_log_chunks(log_path, chunk_size, link_length, frame_size, **csv_options)
+    summary = {"samples": 0, "flagged": 0, "residual": 0, "margin": 0, "no_solution": 0,
+               "max_residual": 0.0, "min_margin": np.inf}
+    with open(out_path, "wb") as out:
+        for t, ys in chunks:
+            result = replay_chunk(t, ys, None, residual_tol, margin_tol,
+                                  link_length, frame_size, square_size)
+            out.write(result.tobytes())
+
+            flags = result["flags"]
+            summary["samples"] += len(result)
+            summary["flagged"] += int(np.count_nonzero(flags))
+            summary["residual"] += int(np.count_nonzero(flags & FLAG_RESIDUAL))
+            summary["margin"] += int(np.count_nonzero(flags & FLAG_MARGIN))
+            summary["no_solution"] += int(np.count_nonzero(flags & FLAG_NO_SOLUTION))
+            if np.isfinite(result["residual"]).any():
+                summary["max_residual"] = max(summary["max_residual"], float(np.nanmax(result["residual"])))
+                summary["min_margin"] = min(summary["min_margin"], float(np.nanmin(result["margin"])))
+    return summary
+
+
+def read_replay(path):
+    """Memory-map the records written by replay."""
+    return np.memmap(path, dtype=RESULT_DTYPE, mode="r")
@@ -0,0 +1,196 @@
+"""Compact binary file format for carriage setpoint streams.
+
+Layout: one fixed-size header record (``HEADER_DTYPE``) followed by packed
+records of ``record_dtype(flags)``: a float64 timestamp and float32 CAR1..CAR4
+positions, plus optional velocities and accelerations. Both are NumPy
+structured dtypes, so a file is read back as a memory map without parsing
+and without loading it into RAM.
+"""
+import os
+
+import numpy as np
+
+from kinematics import B, H, l, ROLLER_GAP
+
+MAGIC = b"XTSSETPT"
+VERSION = 1
+
+# Header flags
+HAS_VELOCITY = 1
+HAS_ACCELERATION = 2
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u2"),
+    ("flags", "<u2"),
+    ("reserved", "<u4"),
+    ("B", "<f8"),
+    ("H", "<f8"),
+    ("l", "<f8"),
+    ("gap", "<f8"),
+    ("count", "<u8"),
+    ("padding", "V8"),
+])  # 64 bytes
+
+
+def record_dtype(flags):
+    """Record layout for a given combination of header flags."""
+    fields = [("t", "<f8"), ("pos", "<f4", (4,))]
+    if flags & HAS_VELOCITY:
+        fields.append(("vel", "<f4", (4,)))
+    if flags & HAS_ACCELERATION:
+        fields.append(("acc", "<f4", (4,)))
+    return np.dtype(fields)
+
+
+def read_header(path):
+    """Read and validate the header of a setpoint file."""
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+    if len(header) != 1 or header["magic"][0] != MAGIC:
+        raise ValueError(f"{path} is not a setpoint file")
+    if header["version"][0] != VERSION:
+        raise ValueError(f"Unsupported setpoint file version {header['version'][0]}")
+    return header[0]
+
+
+class SetpointWriter:
+    """Chunked, append-only writer.
+
+    Samples are collected in a fixed-size buffer and written out chunk by
+    chunk; the sample count in the header is updated on every flush, so a
+    file is always readable up to the last flushed chunk.
+    """
+
+    def __init__(self, path, B=B, H=H, l=l, gap=ROLLER_GAP,
+                 velocities=False, accelerations=False, append=False, chunk_size=65536):
+        flags = (HAS_VELOCITY if velocities else 0) | (HAS_ACCELERATION if accelerations else 0)
+        if append and os.path.exists(path):
+            header = read_header(path)
+            if header["flags"] != flags:
+                raise ValueError("Cannot append: the file stores different fields")
+            stored = tuple(float(header[k]) for k in ("B", "H", "l", "gap"))
+            if not np.allclose(stored, (B, H, l, gap)):
+                raise ValueError(f"Cannot append: the file was written for B, H, l, gap = {stored}")
+            self.file = open(path, "r+b")
+            self.count = int(header["count"])
+            self.header = np.array(header, dtype=HEADER_DTYPE)
+            self.dtype = record_dtype(flags)
+            self.file.seek(HEADER_DTYPE.itemsize + self.count * self.dtype.itemsize)
+            self.file.truncate()
+        else:
+            self.file = open(path, "wb")
+            self.count = 0
+            self.header = np.zeros((), dtype=HEADER_DTYPE)
+            self.header["magic"] = MAGIC
+            self.header["version"] = VERSION
+            self.header["flags"] = flags
+            self.header["B"], self.header["H"], self.header["l"], self.header["gap"] = B, H, l, gap
+            self.dtype = record_dtype(flags)
+            self.file.write(self.header.tobytes())
+        self.flags = flags
+        self.buffer = np.zeros(chunk_size, dtype=self.dtype)
+        self.fill = 0
+
+    def append(self, t, positions, velocities=None, accelerations=None):
+        """Append samples: ``t`` shape ``(n,)``, the others shape ``(n, 4)``."""
+        t = np.atleast_1d(np.asarray(t, dtype=float))
+        columns = {"t": t, "pos": np.asarray(positions).reshape(len(t), 4)}
+        if self.flags & HAS_VELOCITY:
+            if velocities is None:
+                raise ValueError("This file stores velocities")
+            columns["vel"] = np.asarray(velocities).reshape(len(t), 4)
+        if self.flags & HAS_ACCELERATION:
+            if accelerations is None:
+                raise ValueError("This file stores accelerations")
+            columns["acc"] = np.asarray(accelerations).reshape(len(t), 4)
+
+        done = 0
+        while done < len(t):
+            n = min(len(t) - done, len(self.buffer) - self.fill)
+            for name, values in columns.items():
+                self.buffer[name][self.fill:self.fill + n] = values[done:done + n]
+            self.fill += n
+            done += n
+            if self.fill == len(self.buffer):
+                self.flush()
+
+    def flush(self):
+        if self.fill:
+            self.file.write(self.buffer[:self.fill].tobytes())
+            self.count += self.fill
+            self.fill = 0
+        end = self.file.tell()
+        self.header["count"] = self.count
+        self.file.seek(0)
+        self.file.write(self.header.tobytes())
+        self.file.seek(end)
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SetpointReader:
+    """Random-access reader backed by a read-only memory map."""
+
+    def __init__(self, path):
+        self.path = path
+        self.header = read_header(path)
+        self.flags = int(self.header["flags"])
+        self.dtype = record_dtype(self.flags)
+        count = int(self.header["count"])
+        if count:
+            self.records = np.memmap(path, dtype=self.dtype, mode="r",
+                                     offset=HEADER_DTYPE.itemsize, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=self.dtype)
+
+    @property
+    def geometry(self):
+        return {name: float(self.header[name]) for name in ("B", "H", "l", "gap")}
+
+    @property
+    def t(self):
+        return self.records["t"]
+
+    @property
+    def positions(self):
+        return self.records["pos"]
+
+    @property
+    def velocities(self):
+        return self.records["vel"] if self.flags & HAS_VELOCITY else None
+
+    @property
+    def accelerations(self):
+        return self.records["acc"] if self.flags & HAS_ACCELERATION else None
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def chunks(self, chunk_size=65536):
+        """Yield consecutive record slices (views into the memory map)."""
+        for start in range(0, len(self.records), chunk_size):
+            yield self.records[start:start + chunk_size]
+
+
+def write_trajectory(path, n_samples, duration, tck=None, chunk_size=65536, B=B, H=H, l=l, gap=ROLLER_GAP):
+    """Stream the setpoints of a spline path (see trajectory.iter_setpoints) to ``path``."""
+    from trajectory import iter_setpoints
+
+    with SetpointWriter(path, B, H, l, gap, velocities=True, accelerations=True,
+                        chunk_size=chunk_size) as writer:
+        for t, ys, vs, accs in iter_setpoints(n_samples, duration, tck, chunk_size, B, H, l):
+            writer.append(t, ys, vs, accs)
+    return path
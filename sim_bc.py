@@ -1,6 +1,7 @@
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.optimize import root_scalar
+
+from rendering import cached_raster, draw_scenery, frame_extent, show_raster
 
 # Constantes
 H = 100  # Hoogte
@@ -105,102 +106,44 @@ def plot_y_crosses(ax, x_P, y_P, B, H):
     ax.plot([right_x], [y3], 'rx', markersize=10, markeredgewidth=2)
     ax.plot([right_x], [y4], 'rx', markersize=10, markeredgewidth=2)
 
+    return True
+ 
 
-    xs = np.linspace(-B/2, B/2, 1000)
-    y_vals = np.linspace(-H, H, 1000)  # fijn raster y richting (dubbel zo hoog)
-    y_vals2 = np.linspace(-H/2, H/2, 1000)
-
-    Xx, Yy = np.meshgrid(xs, y_vals2)
-    out_of_bounds = np.zeros_like(Xx, dtype=bool)
-
-    def f_curve1(y, x):
-        x1_P = B / 2 + x
-        y1_P = H / 2 - y
-        x2_P = B / 2 + x
-        y2_P = H / 2 + y
-
-        y1 = 50 - (l - np.sqrt(x1_P**2 + y1_P**2))
-        y2 = (l - np.sqrt(x2_P**2 + y2_P**2)) - 50
-
-        return abs(y1 - y2) - 5
-
-    def f_curve2(y, x):
-        x3_P = B / 2 - x
-        y3_P = H / 2 + y
-        x4_P = B / 2 - x
-        y4_P = H / 2 - y
-
-        y3 = (l - np.sqrt(x3_P**2 + y3_P**2)) - 50
-        y4 = 50 - (l - np.sqrt(x4_P**2 + y4_P**2))
-
-        return abs(y3 - y4) - 5
-
-    def find_approx_root(f, x, y_vals, tol=0.5):
-        f_vals = np.array([f(y, x) for y in y_vals])
-        min_idx = np.argmin(np.abs(f_vals))
-        if np.abs(f_vals[min_idx]) < tol:
-            return y_vals[min_idx]
-        else:
-            return np.nan
-
-    ys_curve1 = []
-    ys_curve2 = []
-
-    for x in xs:
-        y1_val = find_approx_root(f_curve1, x, y_vals)
-        ys_curve1.append(y1_val)
-
-        y2_val = find_approx_root(f_curve2, x, y_vals)
-        ys_curve2.append(y2_val)
-
-    ys_curve1 = np.array(ys_curve1)
-    ys_curve2 = np.array(ys_curve2)
-    valid_xs1 = xs[~np.isnan(ys_curve1)]
-    valid_ys1 = ys_curve1[~np.isnan(ys_curve1)]
-
-    valid_xs2 = xs[~np.isnan(ys_curve2)]
-    valid_ys2 = ys_curve2[~np.isnan(ys_curve2)]
-
-    # Plot met dikke lijnen en opvallende kleur
-    ax.plot(valid_xs1, valid_ys1, color='yellow', linewidth=4, label='Boundary Curve 1')
-    ax.plot(valid_xs2, valid_ys2, color='yellow', linewidth=4, label='Boundary Curve 2')
-
-    print(f"Boundary curves plotted: Curve1 {len(valid_xs1)} points, Curve2 {len(valid_xs2)} points")
-
-    for i in range(Xx.shape[0]):
-        for j in range(Xx.shape[1]):
-            x_P = Xx[i, j]
-            y_P = Yy[i, j]
-
-            x1_P = B / 2 + x_P
-            y1_P = H / 2 - y_P
-            d1 = np.sqrt(x1_P**2 + y1_P**2)
+def boundary_curves(B, H, l, threshold=5, resolution=1000, tol=0.5):
+    """Roller-contact curves |y1 - y2| = threshold (left) and |y3 - y4| = threshold (right).
 
-            x2_P = B / 2 + x_P
-            y2_P = H / 2 + y_P
-            d2 = np.sqrt(x2_P**2 + y2_P**2)
+    Per x-column the y with the smallest |f| is taken, as long as it is within
+    ``tol`` of zero, evaluated for the whole grid at once.
+    """
+    xs = np.linspace(-B/2, B/2, resolution)
+    y_vals = np.linspace(-H, H, resolution)  # fijn raster y richting (dubbel zo hoog)
+    x, y = xs[None, :], y_vals[:, None]
 
-            x3_P = B / 2 - x_P
-            y3_P = H / 2 + y_P
-            d3 = np.sqrt(x3_P**2 + y3_P**2)
+    y1 = 50 - (l - np.sqrt((B / 2 + x)**2 + (H / 2 - y)**2))
+    y2 = (l - np.sqrt((B / 2 + x)**2 + (H / 2 + y)**2)) - 50
+    y3 = (l - np.sqrt((B / 2 - x)**2 + (H / 2 + y)**2)) - 50
+    y4 = 50 - (l - np.sqrt((B / 2 - x)**2 + (H / 2 - y)**2))
 
-            x4_P = B / 2 - x_P
-            y4_P = H / 2 - y_P
-            d4 = np.sqrt(x4_P**2 + y4_P**2)
+    curves = []
+    for f in (np.abs(y1 - y2) - threshold, np.abs(y3 - y4) - threshold):
+        idx = np.argmin(np.abs(f), axis=0)
+        found = np.abs(f[idx, np.arange(len(xs))]) < tol
+        curves.append((xs[found], y_vals[idx[found]]))
+    return curves
 
-            # Als één van de afstanden groter of gelijk is dan l: markeer als 'out-of-bounds'
-            if not all(d < l for d in [d1, d2, d3, d4]):
-                out_of_bounds[i, j] = True
 
-    # Contour van out-of-bounds
-    ax.pcolormesh(Xx, Yy, out_of_bounds, shading='auto', cmap='Greens', alpha=0.5)
+def draw_bounds_background(ax, B, H, l):
+    """Frame, out-of-bounds map and boundary curves as one cached image."""
+    def draw(raster_ax):
+        draw_scenery(raster_ax, B, H, l, overlay="cable")
+        for i, (xs, ys) in enumerate(boundary_curves(B, H, l)):
+            # Plot met dikke lijnen en opvallende kleur
+            raster_ax.plot(xs, ys, color='yellow', linewidth=4, label=f'Boundary Curve {i + 1}')
 
-    # Je bestaande curves (optioneel herhalen of toevoegen als overlay)
-    ax.plot(valid_xs1, valid_ys1, color='yellow', linewidth=4, label='Boundary Curve 1')
-    ax.plot(valid_xs2, valid_ys2, color='yellow', linewidth=4, label='Boundary Curve 2')
+    extent = frame_extent(B, H)
+    image = cached_raster(f"sim_bc|{B}|{H}|{l}", extent, draw)
+    return show_raster(ax, image, extent)
 
-    return True
- 
 
 def main():
     fig, ax = plt.subplots(figsize=(6, 9))
@@ -209,10 +152,8 @@ def main():
     fig.patch.set_facecolor('black')
     ax.set_facecolor('black')
 
-    # Plotonderdelen
-    plot_frame(ax, B, H)
-    plot_side_axes(ax, B, H)
-    plot_origin(ax)
+    # Plotonderdelen, out-of-bounds gebied en grenscurves (gecachete achtergrond)
+    draw_bounds_background(ax, B, H, l)
 
     # Define point P
     x_P = 10
@@ -1,6 +1,7 @@
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.optimize import root_scalar
+
+from rendering import draw_background
 
 # Constantes
 H = 100  # Hoogte
@@ -116,10 +117,8 @@ def main():
     fig.patch.set_facecolor('black')
     ax.set_facecolor('black')
 
-    # Plotonderdelen
-    plot_frame(ax, B, H)
-    plot_side_axes(ax, B, H)
-    plot_origin(ax)
+    # Plotonderdelen (frame, assen en oorsprong als gecachete achtergrond)
+    draw_background(ax, B, H, l)
 
     # Define point P
     x_P = 10
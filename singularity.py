@@ -0,0 +1,207 @@
+"""Carriage speed, acceleration and conditioning checks along a whole trajectory.
+
+The animation only checks whether each frame is in bounds. A path can be in
+bounds everywhere and still ask the movers for speeds or accelerations they
+cannot deliver: near a frame corner (small d, the curvature term of
+``carriage_rates`` blows up), near the +-H/2 rail ends, or for the square
+platform where a link turns horizontal and ``sqrt(L^2 - dx^2)`` gets steep.
+
+This module differentiates the batched IK along every frame at once and
+flags the frames where a carriage limit is exceeded. The result is a
+per-frame report (``REPORT_DTYPE``), the flagged segments as frame ranges,
+and a heat-coloured overlay of the path.
+"""
+import numpy as np
+
+import kinematics
+import square_kinematics
+from trajectory import TOTAL_FRAMES, path_waypoints, fit_path, evaluate_path
+
+FRAME_INTERVAL = 0.1  # s per frame, as in the 2D_sim_animation FuncAnimation
+
+# Limits per carriage, in geometry units and seconds
+LIMITS = {
+    "speed": 400.0,          # units/s
+    "acceleration": 1e4,     # units/s^2
+    "condition": 50.0,       # condition number of the IK Jacobian
+    "margin": 2.0,           # minimum distance of a carriage to its rail end
+}
+
+# Flags per frame (bitmask)
+FLAG_SPEED = 1
+FLAG_ACCELERATION = 2
+FLAG_CONDITION = 4
+FLAG_MARGIN = 8
+FLAG_BOUNDS = 16  # out of the workspace (or no IK solution)
+
+FLAG_NAMES = {
+    FLAG_SPEED: "speed",
+    FLAG_ACCELERATION: "acceleration",
+    FLAG_CONDITION: "condition",
+    FLAG_MARGIN: "margin",
+    FLAG_BOUNDS: "bounds",
+}
+
+REPORT_DTYPE = np.dtype([
+    ("frame", "i4"),
+    ("t", "f8"),
+    ("x", "f8"),             # P, or the platform centre
+    ("y", "f8"),
+    ("speed", "f8"),         # largest |carriage velocity|
+    ("acceleration", "f8"),  # largest |carriage acceleration|
+    ("condition", "f8"),
+    ("margin", "f8"),
+    ("flags", "u1"),
+])
+
+
+def _flag(report, limits):
+    with np.errstate(invalid="ignore"):
+        flags = np.where(report["speed"] > limits["speed"], FLAG_SPEED, 0)
+        flags |= np.where(report["acceleration"] > limits["acceleration"], FLAG_ACCELERATION, 0)
+        flags |= np.where(report["condition"] > limits["condition"], FLAG_CONDITION, 0)
+        flags |= np.where(report["margin"] < limits["margin"], FLAG_MARGIN, 0)
+    report["flags"] |= flags.astype(np.uint8)
+    return report
+
+
+# === Point P (cable model) ===
+def point_condition(x_P, y_P, B=kinematics.B, H=kinematics.H):
+    """Condition number of the 4x2 Jacobian dy/dP, from the eigenvalues of J^T J."""
+    units, _ = kinematics.cable_directions(x_P, y_P, B, H)
+    a = np.sum(units[..., 0]**2, axis=-1)
+    b = np.sum(units[..., 0] * units[..., 1], axis=-1)
+    c = np.sum(units[..., 1]**2, axis=-1)
+    root = np.sqrt(((a - c) / 2)**2 + b**2)
+    with np.errstate(divide="ignore"):
+        return np.sqrt(((a + c) / 2 + root) / np.maximum((a + c) / 2 - root, 0.0))
+
+
+def point_report(t, x, y, vx, vy, ax, ay, limits=LIMITS,
+                 B=kinematics.B, H=kinematics.H, l=kinematics.l, gap=kinematics.ROLLER_GAP):
+    """Per-frame report for P moving along ``(x, y)`` with the given derivatives."""
+    x = np.asarray(x, dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ys, ds = kinematics.point_ik(x, y, B, H, l)
+        vs, accs = kinematics.carriage_rates(x, y, vx, vy, ax, ay, B, H)
+        condition = point_condition(x, y, B, H)
+    report = np.zeros(x.shape, dtype=REPORT_DTYPE)
+    report["frame"] = np.arange(len(x))
+    report["t"], report["x"], report["y"] = t, x, y
+    report["speed"] = np.max(np.abs(vs), axis=-1)
+    report["acceleration"] = np.max(np.abs(accs), axis=-1)
+    report["condition"] = condition
+    report["margin"] = H / 2 - np.max(np.abs(ys), axis=-1)
+    status = kinematics.constraint_status(ys, ds, H, l, gap)
+    report["flags"] = np.where(status != kinematics.IN_BOUNDS, FLAG_BOUNDS, 0)
+    return _flag(report, limits)
+
+
+def defined_path_report(duration=TOTAL_FRAMES * FRAME_INTERVAL, n_frames=TOTAL_FRAMES, x0=None, y0=None,
+                        limits=LIMITS, B=kinematics.B, H=kinematics.H, l=kinematics.l,
+                        gap=kinematics.ROLLER_GAP):
+    """Report for the ``defined_path`` spline, traversed in ``duration`` seconds.
+
+    Velocities and accelerations come from the spline derivatives, as in
+    ``trajectory.iter_setpoints``.
+    """
+    tck = fit_path(path_waypoints(x0, y0, B, H))
+    u = np.linspace(0, 1, n_frames)
+    rate = 1.0 / duration
+    x, y = evaluate_path(tck, u)
+    dx, dy = evaluate_path(tck, u, der=1)
+    ddx, ddy = evaluate_path(tck, u, der=2)
+    return point_report(u * duration, x, y, dx * rate, dy * rate, ddx * rate**2, ddy * rate**2,
+                        limits, B, H, l, gap)
+
+
+def sampled_path_report(t, x, y, limits=LIMITS, B=kinematics.B, H=kinematics.H, l=kinematics.l,
+                        gap=kinematics.ROLLER_GAP):
+    """Report for P sampled at times ``t``; derivatives by finite differences."""
+    vx, vy = np.gradient(x, t), np.gradient(y, t)
+    return point_report(t, x, y, vx, vy, np.gradient(vx, t), np.gradient(vy, t), limits, B, H, l, gap)
+
+
+# === Square platform (link model) ===
+def square_jacobian(pose, link_length=square_kinematics.LINK_LENGTH,
+                    frame_size=square_kinematics.FRAME_SIZE, square_size=square_kinematics.SQUARE_SIZE):
+    """Jacobian dy_i/d(cx, cy, theta) of ``square_ik``, shape ``(..., 4, 3)``.
+
+    The ``dx / sqrt(L^2 - dx^2)`` terms grow without bound as a link turns horizontal.
+    """
+    pose = np.asarray(pose, dtype=float)
+    corners = square_kinematics.square_corners(pose[..., 0], pose[..., 1], pose[..., 2], square_size)
+    arm = corners - pose[..., None, :2]
+    dx = square_kinematics.rail_x(frame_size) - corners[..., 0]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = square_kinematics.BRANCH * dx / np.sqrt(link_length**2 - dx**2)
+    return np.stack([slope, np.ones_like(slope), arm[..., 0] - slope * arm[..., 1]], axis=-1)
+
+
+def square_report(t, poses, limits=LIMITS, link_length=square_kinematics.LINK_LENGTH,
+                  frame_size=square_kinematics.FRAME_SIZE, square_size=square_kinematics.SQUARE_SIZE):
+    """Per-frame report for a platform pose trajectory ``poses`` ``(n, 3)`` sampled at ``t``."""
+    t = np.asarray(t, dtype=float)
+    poses = np.asarray(poses, dtype=float)
+    ys = square_kinematics.square_ik(poses[:, 0], poses[:, 1], poses[:, 2],
+                                     link_length, frame_size, square_size)
+    rates = np.gradient(poses, t, axis=0)
+    J = square_jacobian(poses, link_length, frame_size, square_size)
+    with np.errstate(invalid="ignore"):
+        vs = np.einsum("nij,nj->ni", J, rates)
+        accs = np.gradient(vs, t, axis=0)
+    finite = np.all(np.isfinite(J), axis=(-1, -2))
+    condition = np.full(len(t), np.inf)
+    if finite.any():
+        condition[finite] = np.linalg.cond(J[finite])
+
+    report = np.zeros(len(t), dtype=REPORT_DTYPE)
+    report["frame"] = np.arange(len(t))
+    report["t"], report["x"], report["y"] = t, poses[:, 0], poses[:, 1]
+    report["speed"] = np.max(np.abs(vs), axis=-1)
+    report["acceleration"] = np.max(np.abs(accs), axis=-1)
+    report["condition"] = condition
+    report["margin"] = square_kinematics.rail_margin(ys, frame_size)
+    report["flags"] = np.where(~np.all(np.isfinite(ys), axis=-1) | (report["margin"] < 0), FLAG_BOUNDS, 0)
+    return _flag(report, limits)
+
+
+# === Summaries ===
+def flagged_segments(report):
+    """Runs of consecutive flagged frames as ``(start, stop, flags)``, ``stop`` exclusive."""
+    bad = report["flags"] != 0
+    edges = np.diff(np.concatenate([[0], bad.astype(np.int8), [0]]))
+    starts, stops = np.nonzero(edges == 1)[0], np.nonzero(edges == -1)[0]
+    return [(int(a), int(b), int(np.bitwise_or.reduce(report["flags"][a:b]))) for a, b in zip(starts, stops)]
+
+
+def describe_flags(flags):
+    return ", ".join(name for bit, name in FLAG_NAMES.items() if flags & bit) or "ok"
+
+
+def format_report(report, only_flagged=True):
+    """Lines of the per-frame report (by default only the flagged frames)."""
+    lines = [f"{'frame':>6} {'t':>8} {'x':>8} {'y':>8} {'speed':>10} {'accel':>11} {'cond':>8} {'margin':>7}  flags"]
+    for r in report[report["flags"] != 0] if only_flagged else report:
+        lines.append(f"{r['frame']:6d} {r['t']:8.3f} {r['x']:8.2f} {r['y']:8.2f} {r['speed']:10.1f} "
+                     f"{r['acceleration']:11.1f} {r['condition']:8.1f} {r['margin']:7.2f}  "
+                     f"{describe_flags(r['flags'])}")
+    return lines
+
+
+# === Overlay ===
+def heat_overlay(ax, report, key="speed", limit=None, cmap="inferno", linewidth=3):
+    """Draw the path coloured by ``report[key] / limit`` (1 = at the limit); returns the LineCollection."""
+    from matplotlib.collections import LineCollection
+    from matplotlib.colors import Normalize
+
+    if limit is None:
+        limit = LIMITS[key]
+    points = np.stack([report["x"], report["y"]], axis=-1)
+    segments = np.stack([points[:-1], points[1:]], axis=1)
+    value = np.nan_to_num(report[key] / limit, nan=np.inf)
+    heat = np.maximum(value[:-1], value[1:])
+    lines = LineCollection(segments, cmap=cmap, norm=Normalize(0, 1.5), linewidth=linewidth, zorder=3)
+    lines.set_array(np.minimum(heat, 1.5))
+    ax.add_collection(lines)
+    return lines
@@ -0,0 +1,164 @@
+"""Batched kinematics of the square platform from ``2dsim_pos.py``.
+
+Four links of ``LINK_LENGTH`` connect the corners of the square to CAR1..CAR4
+on the two rails. ``square_ik`` is the closed-form inverse (pose -> carriage
+heights); ``square_fk`` is a Gauss-Newton forward solve that handles a whole
+array of carriage states at once instead of one ``least_squares`` call per
+state. ``frame_size`` and ``square_size`` broadcast against the sample shape
+and ``link_length`` against the per-link axis, so every sample can have its
+own (perturbed) geometry.
+"""
+import numpy as np
+
+# === Constants ===
+FRAME_SIZE = 90
+HALF_FRAME = FRAME_SIZE / 2
+LINK_LENGTH = 45
+SQUARE_SIZE = 10
+LENGTH_UNIT = 0.01  # m per geometry unit (the frame is 90 x 90 cm)
+
+CARRIAGE_NAMES = ("CAR1", "CAR2", "CAR3", "CAR4")
+
+# CAR1/CAR4 sit above their corner, CAR2/CAR3 below it
+BRANCH = np.array([1.0, -1.0, -1.0, 1.0])
+
+
+# Corner signs TL, BL, BR, TR (matching CAR1..CAR4)
+CORNER_X_SIGN = np.array([-1.0, -1.0, 1.0, 1.0])
+CORNER_Y_SIGN = np.array([1.0, -1.0, -1.0, 1.0])
+
+
+def local_corners(square_size=SQUARE_SIZE):
+    """Square corners in the platform frame, shape ``(..., 4, 2)``."""
+    h = np.asarray(square_size, dtype=float)[..., None] / 2
+    return np.stack([CORNER_X_SIGN * h, CORNER_Y_SIGN * h], axis=-1)
+
+
+def rail_x(frame_size=FRAME_SIZE):
+    """X-position of the rail under each carriage."""
+    return CORNER_X_SIGN * np.asarray(frame_size, dtype=float)[..., None] / 2
+
+
+def square_corners(cx, cy, theta, square_size=SQUARE_SIZE):
+    """World corners for poses ``(cx, cy, theta)``, shape ``(..., 4, 2)``."""
+    cx, cy, theta = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (cx, cy, theta)))
+    c = np.cos(theta)[..., None]
+    s = np.sin(theta)[..., None]
+    local = local_corners(square_size)
+    x = cx[..., None] + c * local[..., 0] - s * local[..., 1]
+    y = cy[..., None] + s * local[..., 0] + c * local[..., 1]
+    return np.stack([x, y], axis=-1)
+
+
+def square_ik(cx, cy, theta, link_length=LINK_LENGTH, frame_size=FRAME_SIZE, square_size=SQUARE_SIZE):
+    """Carriage heights CAR1..CAR4 for the given poses, shape ``(..., 4)``.
+
+    A link that cannot reach its rail gives NaN.
+    """
+    corners = square_corners(cx, cy, theta, square_size)
+    dx = rail_x(frame_size) - corners[..., 0]
+    with np.errstate(invalid="ignore"):
+        reach = np.sqrt(link_length**2 - dx**2)
+    return corners[..., 1] + BRANCH * reach
+
+
+def link_residuals(pose, ys, link_length=LINK_LENGTH, frame_size=FRAME_SIZE, square_size=SQUARE_SIZE):
+    """Link length error |corner - carriage| - L for poses ``(..., 3)``, shape ``(..., 4)``."""
+    pose = np.asarray(pose, dtype=float)
+    corners = square_corners(pose[..., 0], pose[..., 1], pose[..., 2], square_size)
+    dx = corners[..., 0] - rail_x(frame_size)
+    dy = corners[..., 1] - np.asarray(ys, dtype=float)
+    return np.hypot(dx, dy) - link_length
+
+
+def rail_margin(ys, frame_size=FRAME_SIZE):
+    """Smallest distance of any carriage to the end of its rail (negative = off the rail)."""
+    return frame_size / 2 - np.max(np.abs(ys), axis=-1)
+
+
+def initial_pose(ys, link_length=LINK_LENGTH, frame_size=FRAME_SIZE, square_size=SQUARE_SIZE):
+    """Closed-form pose estimate from the carriage heights, used to seed square_fk.
+
+    Exact for an unrotated square; the rail spreads give the x-offset and the
+    left/right mean heights give the tilt.
+    """
+    ys = np.asarray(ys, dtype=float)
+    links = np.broadcast_to(link_length, ys.shape)
+    link_left = (links[..., 0] + links[..., 1]) / 2
+    link_right = (links[..., 2] + links[..., 3]) / 2
+    h = np.asarray(square_size, dtype=float) / 2
+    half = np.asarray(frame_size, dtype=float) / 2
+    cy = ys.mean(axis=-1)
+    reach_left = np.clip((ys[..., 0] - ys[..., 1]) / 2 - h, 0, link_left)
+    reach_right = np.clip((ys[..., 3] - ys[..., 2]) / 2 - h, 0, link_right)
+    x_left = -half + np.sqrt(link_left**2 - reach_left**2) + h
+    x_right = half - np.sqrt(link_right**2 - reach_right**2) - h
+    cx = (x_left + x_right) / 2
+    tilt = ((ys[..., 2] + ys[..., 3]) - (ys[..., 0] + ys[..., 1])) / (4 * h)
+    theta = np.arcsin(np.clip(tilt, -1, 1))
+    return np.stack([cx, cy, theta], axis=-1)
+
+
+def _link_terms(pose, ys, local, rails, link_length):
+    """Link residuals ``(n, 4)`` and their Jacobian ``(n, 4, 3)`` for flat poses ``(n, 3)``."""
+    c = np.cos(pose[:, 2])[:, None]
+    s = np.sin(pose[:, 2])[:, None]
+    arm_x = c * local[..., 0] - s * local[..., 1]
+    arm_y = s * local[..., 0] + c * local[..., 1]
+    dx = pose[:, 0, None] + arm_x - rails
+    dy = pose[:, 1, None] + arm_y - ys
+    dist = np.hypot(dx, dy)
+    ux = dx / dist
+    uy = dy / dist
+    return dist - link_length, np.stack([ux, uy, ux * -arm_y + uy * arm_x], axis=-1)
+
+
+def square_fk(ys, guess=None, iterations=30, tol=1e-10,
+              link_length=LINK_LENGTH, frame_size=FRAME_SIZE, square_size=SQUARE_SIZE):
+    """Solve the platform pose for carriage heights ``ys`` of shape ``(..., 4)``.
+
+    Levenberg-Marquardt on the four link-length residuals, run on all samples
+    at once with a damping factor per sample: a step is only taken if it
+    lowers that sample's squared residual. Consistent carriage states converge
+    like plain Gauss-Newton; states the links cannot close (the jog start of
+    ``2dsim_pos.py``) settle on a least-squares pose instead of oscillating.
+    Returns ``(pose, residuals)`` with pose ``(..., 3)`` = (cx, cy, theta).
+    """
+    ys = np.asarray(ys, dtype=float)
+    shape = ys.shape[:-1]
+    ys = ys.reshape(-1, 4)
+    link_length = np.broadcast_to(link_length, shape + (4,)).reshape(-1, 4)
+    frame_size = np.broadcast_to(frame_size, shape).reshape(-1)
+    square_size = np.broadcast_to(square_size, shape).reshape(-1)
+    if guess is None:
+        pose = initial_pose(ys, link_length, frame_size, square_size)
+    else:
+        pose = np.broadcast_to(np.asarray(guess, dtype=float), shape + (3,)).reshape(-1, 3).copy()
+    pose = np.where(np.isfinite(pose), pose, 0.0)
+    local = local_corners(square_size)
+    rails = rail_x(frame_size)
+    eye = np.eye(3)
+    lam = np.full(len(pose), 1e-6)
+
+    r, J = _link_terms(pose, ys, local, rails, link_length)
+    cost = np.sum(r**2, axis=-1)
+    for _ in range(iterations):
+        JT = np.swapaxes(J, 1, 2)
+        JTJ = JT @ J
+        scale = np.diagonal(JTJ, axis1=1, axis2=2)[..., None] * eye + 1e-9 * eye
+        step = np.linalg.solve(JTJ + lam[:, None, None] * scale, -(JT @ r[..., None]))[..., 0]
+        trial = pose + step
+        r_new, J_new = _link_terms(trial, ys, local, rails, link_length)
+        cost_new = np.sum(r_new**2, axis=-1)
+        better = cost_new <= cost
+        pose = np.where(better[:, None], trial, pose)
+        r = np.where(better[:, None], r_new, r)
+        J = np.where(better[:, None, None], J_new, J)
+        cost = np.where(better, cost_new, cost)
+        lam = np.where(better, np.maximum(lam / 3, 1e-12), lam * 4)
+        if not np.any(np.abs(step) >= tol):
+            break
+
+    pose[~np.all(np.isfinite(ys), axis=-1)] = np.nan  # no pose for missing carriage values
+    residuals = link_residuals(pose, ys, link_length, frame_size, square_size)
+    return pose.reshape(shape + (3,)), residuals.reshape(shape + (4,))
@@ -0,0 +1,202 @@
+"""Cable tensions and wrench feasibility for the cable-driven platform.
+
+The cables can only pull, so a pose is usable only if the four tensions that
+balance the required wrench all stay between ``T_MIN`` (no slack) and
+``T_MAX``. For every pose the structure matrix ``A`` maps tensions to the
+wrench on the platform (``A t = w``); with four cables and two (point) or
+three (square) degrees of freedom the tensions have a null space, so:
+
+* ``tension_distribution`` picks the closed-form solution closest to the
+  middle tension ``(T_MIN + T_MAX) / 2``;
+* ``wrench_feasible`` decides exactly whether *any* admissible distribution
+  exists, by checking the vertices of the tension polytope (each one a small
+  linear solve with ``4 - m`` cables held at a bound).
+
+Everything is batched over the leading axes: a whole workspace grid or
+trajectory is one set of stacked small solves. Forces are in N, masses in kg
+and accelerations in m/s^2. Poses are in geometry units; the moment arms of
+the square are converted to metres with ``square_kinematics.LENGTH_UNIT`` so
+moments come out in N m.
+"""
+import itertools
+
+import numpy as np
+
+import kinematics
+import square_kinematics
+
+GRAVITY = np.array([0.0, -9.81])  # the frame stands vertically, y up
+MASS = 0.5    # kg, platform + ball
+INERTIA = 1e-3  # kg m^2, square platform about its centre
+T_MIN = 2.0   # N, below this a cable is considered slack
+T_MAX = 200.0  # N, cable / mover force limit
+
+# Status codes
+FEASIBLE = 0
+SLACK = 1
+OVER_TENSION = 2
+
+STATUS_MESSAGES = {
+    FEASIBLE: "Cables can carry the load",
+    SLACK: "A cable goes slack",
+    OVER_TENSION: "A cable is over-tensioned",
+}
+
+
+# === Structure matrices ===
+def point_structure_matrix(x_P, y_P, B=kinematics.B, H=kinematics.H):
+    """Force on P per unit tension, shape ``(..., 2, 4)`` (cables pull towards the corners)."""
+    units, _ = kinematics.cable_directions(x_P, y_P, B, H)
+    return -np.swapaxes(units, -1, -2)
+
+
+def square_structure_matrix(pose, ys, frame_size=square_kinematics.FRAME_SIZE,
+                            square_size=square_kinematics.SQUARE_SIZE):
+    """Wrench (fx, fy, moment) on the square per unit link tension, shape ``(..., 3, 4)``.
+
+    The moment row is in N m per N, to match ``INERTIA * alpha``.
+    """
+    pose = np.asarray(pose, dtype=float)
+    corners = square_kinematics.square_corners(pose[..., 0], pose[..., 1], pose[..., 2], square_size)
+    carriages = np.stack(np.broadcast_arrays(square_kinematics.rail_x(frame_size),
+                                             np.asarray(ys, dtype=float)), axis=-1)
+    link = carriages - corners
+    u = link / np.linalg.norm(link, axis=-1, keepdims=True)
+    arm = (corners - pose[..., None, :2]) * square_kinematics.LENGTH_UNIT  # m
+    moment = arm[..., 0] * u[..., 1] - arm[..., 1] * u[..., 0]
+    return np.stack([u[..., 0], u[..., 1], moment], axis=-2)
+
+
+# === Required wrench ===
+def required_wrench(mass=MASS, acc=(0.0, 0.0), inertia=None, alpha=0.0, gravity=GRAVITY):
+    """Wrench the cables must supply: ``m (a - g)``, plus ``J alpha`` if ``inertia`` is given."""
+    acc = np.asarray(acc, dtype=float)
+    force = np.asarray(mass, dtype=float)[..., None] * (acc - gravity)
+    if inertia is None:
+        return force
+    moment = np.asarray(inertia, dtype=float) * np.asarray(alpha, dtype=float)
+    force, moment = np.broadcast_arrays(force, moment[..., None])
+    return np.concatenate([force, moment[..., :1]], axis=-1)
+
+
+# === Tension distribution ===
+def tension_distribution(A, w, t_min=T_MIN, t_max=T_MAX):
+    """Closed-form tensions ``t = t_m + A^+ (w - A t_m)`` nearest the middle tension."""
+    A = np.asarray(A, dtype=float)
+    w = np.broadcast_to(np.asarray(w, dtype=float), A.shape[:-1])
+    t_mid = np.full(A.shape[:-2] + (A.shape[-1],), (t_min + t_max) / 2)
+    residual = w - np.einsum("...ij,...j->...i", A, t_mid)
+    AT = np.swapaxes(A, -1, -2)
+    correction = AT @ np.linalg.solve(A @ AT, residual[..., None])
+    return t_mid + correction[..., 0]
+
+
+def _vertex_candidates(A, w, t_min, t_max):
+    """Tension vectors at the vertices of {A t = w, t_min <= t <= t_max}, shape ``(..., k, 4)``."""
+    m, n = A.shape[-2:]
+    candidates = []
+    for fixed in itertools.combinations(range(n), n - m):
+        free = [j for j in range(n) if j not in fixed]
+        A_free = A[..., free]
+        for bounds in itertools.product((t_min, t_max), repeat=n - m):
+            rhs = w - sum(A[..., :, j] * b for j, b in zip(fixed, bounds))
+            with np.errstate(all="ignore"):
+                try:
+                    t_free = np.linalg.solve(A_free, rhs[..., None])[..., 0]
+                except np.linalg.LinAlgError:
+                    t_free = _solve_or_nan(A_free, rhs)
+            t = np.empty(A.shape[:-2] + (n,))
+            t[..., free] = t_free
+            for j, b in zip(fixed, bounds):
+                t[..., j] = b
+            candidates.append(t)
+    return np.stack(candidates, axis=-2)
+
+
+def _solve_or_nan(A, b):
+    """Batched solve that leaves NaN for the singular systems instead of raising."""
+    flat_A = A.reshape(-1, *A.shape[-2:])
+    flat_b = b.reshape(-1, b.shape[-1])
+    out = np.full(flat_b.shape, np.nan)
+    singular = np.abs(np.linalg.det(flat_A)) < 1e-12
+    if np.any(~singular):
+        out[~singular] = np.linalg.solve(flat_A[~singular], flat_b[~singular][..., None])[..., 0]
+    return out.reshape(b.shape)
+
+
+def wrench_feasible(A, w, t_min=T_MIN, t_max=T_MAX, tol=1e-9):
+    """Exact feasibility: True where some admissible tension distribution exists.
+
+    Also returns the feasible vertex nearest the middle tension (NaN where infeasible).
+    """
+    A = np.asarray(A, dtype=float)
+    w = np.broadcast_to(np.asarray(w, dtype=float), A.shape[:-1])
+    candidates = _vertex_candidates(A, w, t_min, t_max)
+    ok = np.all((candidates >= t_min - tol) & (candidates <= t_max + tol), axis=-1)
+    spread = np.where(ok, np.max(np.abs(candidates - (t_min + t_max) / 2), axis=-1), np.inf)
+    best = np.take_along_axis(candidates, np.argmin(spread, axis=-1)[..., None, None], axis=-2)[..., 0, :]
+    feasible = np.any(ok, axis=-1)
+    return feasible, np.where(feasible[..., None], best, np.nan)
+
+
+def solve_tensions(A, w, t_min=T_MIN, t_max=T_MAX):
+    """Tensions and status per pose.
+
+    Uses the closed-form distribution where it is admissible and falls back to
+    the best feasible vertex otherwise. Infeasible poses report SLACK or
+    OVER_TENSION from the closed-form solution.
+    """
+    t = tension_distribution(A, w, t_min, t_max)
+    admissible = np.all((t >= t_min) & (t <= t_max), axis=-1)
+    feasible, vertex = wrench_feasible(A, w, t_min, t_max)
+    t = np.where((~admissible & feasible)[..., None], vertex, t)
+
+    status = np.full(t.shape[:-1], FEASIBLE, dtype=np.int8)
+    status[~feasible & (np.max(t, axis=-1) > t_max)] = OVER_TENSION
+    status[~feasible & (np.min(t, axis=-1) < t_min)] = SLACK
+    return t, status
+
+
+# === Batched maps ===
+def point_tension_map(resolution=200, mass=MASS, acc=(0.0, 0.0), t_min=T_MIN, t_max=T_MAX,
+                      B=kinematics.B, H=kinematics.H, l=kinematics.l, gap=kinematics.ROLLER_GAP):
+    """Tension status over the workspace of P for one acceleration.
+
+    Returns ``(xs, ys, status, tensions)``; status is -1 outside the kinematic workspace.
+    """
+    xs, ys, mask = kinematics.workspace_grid(B, H, l, gap, resolution)
+    with np.errstate(invalid="ignore", divide="ignore"):  # the frame corners themselves
+        A = point_structure_matrix(xs[None, :], ys[:, None], B, H)
+        w = np.broadcast_to(required_wrench(mass, acc), A.shape[:-2] + (2,))
+        tensions, status = solve_tensions(A, w, t_min, t_max)
+    status = np.where(mask, status, -1).astype(np.int8)
+    return xs, ys, status, tensions
+
+
+def point_trajectory_tensions(x_P, y_P, ax, ay, mass=MASS, t_min=T_MIN, t_max=T_MAX,
+                              B=kinematics.B, H=kinematics.H):
+    """Tensions and status along a path of P with accelerations ``(ax, ay)`` in m/s^2."""
+    A = point_structure_matrix(x_P, y_P, B, H)
+    acc = np.stack(np.broadcast_arrays(np.asarray(ax, dtype=float), np.asarray(ay, dtype=float)), axis=-1)
+    return solve_tensions(A, required_wrench(mass, acc), t_min, t_max)
+
+
+def square_pose_tensions(pose, mass=MASS, acc=(0.0, 0.0), inertia=INERTIA, alpha=0.0,
+                         t_min=T_MIN, t_max=T_MAX, link_length=square_kinematics.LINK_LENGTH,
+                         frame_size=square_kinematics.FRAME_SIZE,
+                         square_size=square_kinematics.SQUARE_SIZE):
+    """Link tensions and status for square poses ``(..., 3)`` (IK gives the carriages)."""
+    pose = np.asarray(pose, dtype=float)
+    ys = square_kinematics.square_ik(pose[..., 0], pose[..., 1], pose[..., 2],
+                                     link_length, frame_size, square_size)
+    A = square_structure_matrix(pose, ys, frame_size, square_size)
+    w = np.broadcast_to(required_wrench(mass, acc, inertia, alpha), A.shape[:-2] + (3,))
+    return solve_tensions(A, w, t_min, t_max)
+
+
+def throw_feasible(x_P, y_P, throw_acc, mass=MASS, t_min=T_MIN, t_max=T_MAX,
+                   B=kinematics.B, H=kinematics.H):
+    """True where P can be accelerated with ``throw_acc`` (shape ``(..., 2)``) without losing a cable."""
+    A = point_structure_matrix(x_P, y_P, B, H)
+    feasible, _ = wrench_feasible(A, required_wrench(mass, throw_acc), t_min, t_max)
+    return feasible
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+import ballflight
+import dynamics
+
+NO_ERRORS = {"timing": 0.0, "speed": 0.0, "angle": 0.0, "position": 0.0}
+
+
+@pytest.fixture(scope="module")
+def throw():
+    _, poses, _ = dynamics.pose_motion([0, -15, 0], [0, 10, 0], 0.15, settle=1.0)
+    return np.arange(len(poses)) * dynamics.DT, poses
+
+
+@pytest.mark.parametrize("errors", [
+    {"angle": 0.01},
+    {"speed": 0.02},
+    {"timing": 2e-3},
+    ballflight.RELEASE_ERRORS,
+])
+def test_small_release_errors_are_caught(throw, errors):
+    t, poses = throw
+    results = ballflight.simulate_throws(t, poses, n_throws=2000, errors={**NO_ERRORS, **errors})
+    summary = ballflight.summarize(results)
+    assert summary["failed_releases"] == 0
+    assert summary["success_rate"] > 0.98
+
+
+def test_early_or_slow_ball_leaves_with_the_face(throw):
+    t, poses = throw
+    t_lift = ballflight.separation_time(t, poses)
+    t0 = np.array([t_lift - 5e-3, t_lift, t_lift])
+    p0, v0 = ballflight.release_state(t, poses, t0)
+    v0[2] *= 0.9  # slower than the face
+    results = ballflight.catch_events(t0, p0, v0, t, poses)
+    np.testing.assert_allclose(results["t_release"], t_lift)
+    assert np.all(results["caught"])
+    assert np.all(results["t_catch"] - t_lift > 0.1)  # a real flight, not the face touching the ball
+
+
+def test_no_lift_off_is_a_failed_release(throw):
+    t, poses = throw
+    t0 = np.array([t[-1] - 0.1])  # holding still: the face never lifts off again
+    p0, v0 = ballflight.release_state(t, poses, t0)
+    results = ballflight.catch_events(t0, p0, v0, t, poses)
+    assert not results["released"][0] and not results["caught"][0]
+    assert ballflight.summarize(results)["failed_releases"] == 1
@@ -0,0 +1,59 @@
+import importlib
+
+import numpy as np
+import pytest
+
+import coupling
+
+dsim_pos = importlib.import_module("2dsim_pos")
+
+# (fixed partner, mirror1, mirror2) per moved carriage, as in the old update_carriages
+OLD_PAIRS = {0: (1, 2, 3), 1: (0, 2, 3), 2: (3, 0, 1), 3: (2, 0, 1)}
+
+
+def old_update(ys, manual_index, delta):
+    """The if/elif rule of update_carriages before it used coupling.MIRROR_COUPLING."""
+    if manual_index not in OLD_PAIRS:
+        raise ValueError("Invalid carriage index")
+    fixed, mirror1, mirror2 = OLD_PAIRS[manual_index]
+    ys = list(ys)
+    old_fixed = ys[fixed]
+    ys[manual_index] += delta
+    mirror_change = -delta / 2
+    ys[mirror1] += mirror_change
+    ys[mirror2] -= mirror_change
+    ys[fixed] = old_fixed
+    return ys
+
+
+@pytest.fixture
+def carriages(monkeypatch):
+    """Fresh carriage state of 2dsim_pos, without the least_squares solve."""
+    state = {name: pos.copy() for name, pos in dsim_pos.carriage_positions.items()}
+    monkeypatch.setattr(dsim_pos, "carriage_positions", state)
+    monkeypatch.setattr(dsim_pos, "solve_square", lambda: None)
+    return state
+
+
+def test_update_carriages_matches_old_rule(carriages):
+    rng = np.random.default_rng(0)
+    expected = [pos[1] for pos in carriages.values()]
+    for index, delta in zip(rng.integers(0, 4, 200), rng.choice([-1.0, 1.0, 0.5, -2.5], 200)):
+        expected = old_update(expected, int(index), float(delta))
+        dsim_pos.update_carriages(int(index), float(delta))
+        np.testing.assert_allclose([pos[1] for pos in carriages.values()], expected, atol=1e-12)
+
+
+def test_update_carriages_rejects_bad_index(carriages):
+    with pytest.raises(ValueError):
+        dsim_pos.update_carriages(4, 1.0)
+
+
+def test_carriage_sequence_matches_old_rule():
+    indices, deltas = coupling.keys_to_commands("aazwwxecrrv" * 5, delta=1.5)
+    expected = list(coupling.INITIAL_CARRIAGES)
+    states = []
+    for index, delta in zip(indices, deltas):
+        expected = old_update(expected, int(index), float(delta))
+        states.append(expected)
+    np.testing.assert_allclose(coupling.carriage_sequence(indices, deltas), states, atol=1e-12)
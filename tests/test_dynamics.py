@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+import dynamics
+
+
+def test_unreachable_move_raises():
+    with pytest.raises(ValueError, match="not reachable"):
+        dynamics.pose_motion((0, 0, 0), (5, 5, 0.05), 0.1)
+
+
+def test_evaluate_rejects_non_finite_carriages():
+    ys, poses, n_move, _ = dynamics.motion_batch((0, 0, 0), (2, 1, 0.02), [0.05], ["quintic"], settle=0.01)
+    ys[0, 10, 1] = np.nan
+    with pytest.raises(ValueError, match="non-finite"):
+        dynamics.evaluate(ys, poses, n_move)
+
+
+def test_reachable_moves_are_scored():
+    ys, poses, n_move, labels = dynamics.motion_batch((0, 0, 0), (2, 1, 0.02), [0.05, 0.1],
+                                                      ["linear", "quintic"], settle=0.02)
+    metrics, _ = dynamics.evaluate(ys, poses, n_move)
+    assert len(labels) == 4
+    assert np.all(np.isfinite(metrics["rms_error"]))
+    assert sorted(dynamics.rank(metrics)) == [0, 1, 2, 3]
@@ -0,0 +1,23 @@
+import numpy as np
+
+import incremental_ik
+import square_kinematics
+
+
+def test_square_fk_tracks_the_exact_solve():
+    u = np.linspace(0, 2 * np.pi, 2000)
+    poses = np.stack([3 * np.sin(u), 10 * np.cos(u), 0.1 * np.sin(2 * u)], axis=-1)
+    ys = square_kinematics.square_ik(poses[:, 0], poses[:, 1], poses[:, 2])
+    fk = incremental_ik.IncrementalSquareFK(ys[0], reanchor_every=500)
+    tracked = np.array([fk.update(y.tolist()) for y in ys])
+    np.testing.assert_allclose(tracked, poses, atol=1e-3)
+    assert fk.stats["steps"] == len(ys)
+    assert fk.stats["anchors"] >= 1 + len(ys) // 500
+    assert fk.stats["max_drift"] <= incremental_ik.DRIFT_TOL
+
+
+def test_solve3_matches_numpy():
+    rng = np.random.default_rng(0)
+    a, b = rng.normal(size=(3, 3)), rng.normal(size=3)
+    np.testing.assert_allclose(incremental_ik._solve3(a.tolist(), b.tolist()), np.linalg.solve(a, b))
+    assert incremental_ik._solve3([[1, 2, 3], [2, 4, 6], [0, 0, 1]], [1, 2, 3]) is None
@@ -0,0 +1,66 @@
+import numpy as np
+
+import kinematics
+import simulation_base
+
+
+class RecordingAxes:
+    """Stands in for a matplotlib Axes and keeps the plotted points."""
+
+    def __init__(self):
+        self.points = []
+
+    def plot(self, x, y, *args, **kwargs):
+        self.points.append((x[0], y[0]))
+
+
+def crosses(x_P, y_P):
+    ax = RecordingAxes()
+    ok = simulation_base.plot_y_crosses(ax, x_P, y_P, simulation_base.B, simulation_base.H)
+    return ok, ax.points
+
+
+def test_point_ik_matches_plot_y_crosses(capsys):
+    B, H = simulation_base.B, simulation_base.H
+    checked = 0
+    for x_P in np.linspace(-B / 2 + 1, B / 2 - 1, 15):
+        for y_P in np.linspace(-H / 2 + 1, H / 2 - 1, 25):
+            ok, points = crosses(x_P, y_P)
+            ys, ds = kinematics.point_ik(x_P, y_P, B, H, simulation_base.l)
+            status = kinematics.constraint_status(ys, ds, H, simulation_base.l)
+            assert ok == (status == kinematics.IN_BOUNDS), (x_P, y_P)
+            if ok:
+                checked += 1
+                np.testing.assert_allclose([p[1] for p in points], ys, atol=1e-9)
+                np.testing.assert_allclose([p[0] for p in points], [-B / 2, -B / 2, B / 2, B / 2])
+    capsys.readouterr()
+    assert checked > 0
+
+
+def test_point_ik_batches_like_single_points():
+    x = np.array([-10.0, 0.0, 12.5])
+    y = np.array([5.0, -20.0, 30.0])
+    ys, ds = kinematics.point_ik(x, y)
+    for k in range(len(x)):
+        ys_k, ds_k = kinematics.point_ik(x[k], y[k])
+        np.testing.assert_allclose(ys[k], ys_k)
+        np.testing.assert_allclose(ds[k], ds_k)
+
+
+def test_constraint_masks_agree_with_status_design_and_maps():
+    import design
+    import workspace_maps
+
+    x = np.linspace(-kinematics.B / 2, kinematics.B / 2, 121)[None, :]
+    y = np.linspace(-kinematics.H / 2, kinematics.H / 2, 201)[:, None]
+    args = (kinematics.B, kinematics.H, kinematics.l, kinematics.ROLLER_GAP)
+    ys, ds = kinematics.point_ik(x, y, kinematics.B, kinematics.H, kinematics.l)
+    status = kinematics.constraint_status(ys, ds)
+    inside = status == kinematics.IN_BOUNDS
+    np.testing.assert_array_equal(design._feasible(x, y, *args), inside)
+    np.testing.assert_array_equal(workspace_maps._constraint_predicate(None, *args)(x, y), inside)
+    rollers = workspace_maps._constraint_predicate("rollers", *args)(x, y)
+    assert np.all(rollers[status == kinematics.IN_BOUNDS])
+    assert not np.any(rollers[status == kinematics.ROLLERS_TOUCH])
+    cable = workspace_maps._constraint_predicate("cable", *args)(x, y)
+    np.testing.assert_array_equal(cable, status != kinematics.LINK_TOO_SHORT)
@@ -0,0 +1,19 @@
+import numpy as np
+
+import pose_workspace
+
+
+def test_fraction_counts_the_packed_bits():
+    volume = pose_workspace.reachable_volume(resolution=61, theta_steps=9)
+    assert volume.fraction() == volume.to_dense().mean()
+    assert volume.fraction() > 0.2
+
+
+def test_volume_keeps_every_reachable_pose():
+    volume = pose_workspace.reachable_volume(resolution=61, theta_steps=9)
+    grid = np.linspace(-45, 45, 61)
+    assert len(volume.cxs) < 20 and np.all(np.isin(volume.cxs, grid)) and np.all(np.isin(volume.cys, grid))
+    full = pose_workspace.reachable(grid[None, None, :], grid[None, :, None], volume.thetas[:, None, None])
+    assert full.sum() == volume.to_dense().sum()
+    rows, cols = np.isin(grid, volume.cys), np.isin(grid, volume.cxs)
+    np.testing.assert_array_equal(full[:, rows][:, :, cols], volume.to_dense())
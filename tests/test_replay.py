@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+import replay
+import setpoints
+import square_kinematics
+
+
+def carriage_log(n=20):
+    t = np.arange(n) * 1e-3
+    cx = np.linspace(-2.0, 2.0, n)
+    ys = square_kinematics.square_ik(cx, 0.0, 0.0)
+    return t, ys
+
+
+def test_dropout_rows_are_flagged():
+    t, ys = carriage_log()
+    ys[5, 2] = np.nan
+    out = replay.replay_chunk(t, ys)
+    assert out["flags"][5] & replay.FLAG_NO_SOLUTION
+    assert np.isnan(out["cx"][5])
+    ok = np.arange(len(t)) != 5
+    assert not np.any(out["flags"][ok] & replay.FLAG_NO_SOLUTION)
+    np.testing.assert_allclose(out["cx"][ok], np.linspace(-2.0, 2.0, len(t))[ok], atol=1e-6)
+
+
+def test_replay_square_setpoint_file(tmp_path):
+    t, ys = carriage_log()
+    ys[3] = np.nan
+    path, out = str(tmp_path / "log.bin"), str(tmp_path / "out.bin")
+    with setpoints.SetpointWriter(path, B=square_kinematics.FRAME_SIZE, H=square_kinematics.FRAME_SIZE,
+                                  l=square_kinematics.LINK_LENGTH) as writer:
+        writer.append(t, ys)
+    summary = replay.replay(path, out)
+    assert summary["samples"] == len(t)
+    assert summary["no_solution"] == 1
+    assert len(replay.read_replay(out)) == len(t)
+
+
+def test_cable_model_file_is_rejected(tmp_path):
+    t, ys = carriage_log()
+    path, out = str(tmp_path / "log.bin"), tmp_path / "out.bin"
+    with setpoints.SetpointWriter(path) as writer:  # cable-model geometry
+        writer.append(t, ys)
+    with pytest.raises(ValueError, match="square"):
+        replay.replay(path, str(out))
+    assert not out.exists()
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+import setpoints
+
+
+def write(path, n=10, **geometry):
+    with setpoints.SetpointWriter(str(path), chunk_size=4, **geometry) as writer:
+        writer.append(np.arange(n) * 1e-3, np.arange(4 * n).reshape(n, 4))
+
+
+def test_round_trip(tmp_path):
+    write(tmp_path / "a.bin", B=90.0, H=90.0, l=45.0)
+    reader = setpoints.SetpointReader(str(tmp_path / "a.bin"))
+    assert len(reader) == 10
+    assert reader.geometry == {"B": 90.0, "H": 90.0, "l": 45.0, "gap": setpoints.ROLLER_GAP}
+    np.testing.assert_allclose(reader.positions, np.arange(40).reshape(10, 4))
+
+
+def test_append_keeps_existing_samples(tmp_path):
+    path = tmp_path / "a.bin"
+    write(path, n=5)
+    with setpoints.SetpointWriter(str(path), append=True) as writer:
+        writer.append([1.0], [[1, 2, 3, 4]])
+    reader = setpoints.SetpointReader(str(path))
+    assert len(reader) == 6
+    np.testing.assert_allclose(reader.positions[-1], [1, 2, 3, 4])
+
+
+def test_append_rejects_other_geometry(tmp_path):
+    path = tmp_path / "a.bin"
+    write(path, n=5)
+    with pytest.raises(ValueError, match="written for"):
+        setpoints.SetpointWriter(str(path), B=999.0, append=True)
+    assert len(setpoints.SetpointReader(str(path))) == 5  # file left untouched
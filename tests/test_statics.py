@@ -0,0 +1,30 @@
+import numpy as np
+
+import square_kinematics
+import statics
+
+
+def test_square_moment_arms_are_in_metres():
+    rng = np.random.default_rng(0)
+    poses = np.stack([rng.uniform(-4, 4, 50), rng.uniform(-15, 15, 50), rng.uniform(-0.3, 0.3, 50)], axis=-1)
+    ys = square_kinematics.square_ik(poses[:, 0], poses[:, 1], poses[:, 2])
+    reachable = np.all(np.isfinite(ys), axis=-1)
+    assert reachable.sum() > 10
+    poses, ys = poses[reachable], ys[reachable]
+    A = statics.square_structure_matrix(poses, ys)
+    np.testing.assert_allclose(np.hypot(A[:, 0], A[:, 1]), 1.0)
+    # Moment per newton of tension: at most the corner distance, in metres
+    lever = square_kinematics.SQUARE_SIZE / np.sqrt(2) * square_kinematics.LENGTH_UNIT
+    assert np.all(np.abs(A[:, 2]) <= lever + 1e-12)
+    assert np.max(np.abs(A[:, 2])) > lever / 10
+
+
+def test_square_tensions_balance_the_angular_acceleration():
+    pose = np.array([0.0, 0.0, 0.1])
+    alpha = 50.0
+    tensions, status = statics.square_pose_tensions(pose, alpha=alpha)
+    assert status == statics.FEASIBLE
+    ys = square_kinematics.square_ik(*pose)
+    wrench = statics.square_structure_matrix(pose, ys) @ tensions
+    np.testing.assert_allclose(wrench[2], statics.INERTIA * alpha, atol=1e-9)
+    np.testing.assert_allclose(wrench[:2], -statics.MASS * statics.GRAVITY, atol=1e-9)
@@ -0,0 +1,35 @@
+import numpy as np
+
+import pose_workspace
+import tolerance
+
+
+def test_point_grid_without_workspace_gives_nan_maps():
+    xs, ys, maps = tolerance.point_grid_analysis(resolution=10, n_samples=10, workers=1, l=40)
+    assert set(maps) == {"mean", "std", "max", "p50", "p95", "p99"}
+    for grid in maps.values():
+        assert grid.shape == (len(ys), len(xs))
+        assert np.all(np.isnan(grid))
+
+
+def test_square_grid_without_workspace_gives_nan_maps():
+    xs, ys, position, angle = tolerance.square_grid_analysis(resolution=8, n_samples=10, workers=1,
+                                                             link_length=10)
+    assert np.all(np.isnan(position["mean"])) and np.all(np.isnan(angle["max"]))
+
+
+def test_square_grid_covers_the_reachable_band():
+    xs, ys, position, angle = tolerance.square_grid_analysis(resolution=20, n_samples=50, workers=1)
+    reachable = np.isfinite(position["mean"])
+    assert reachable.mean() > 0.5  # not a thin strip of a frame-sized grid
+    np.testing.assert_array_equal(reachable, pose_workspace.reachable(xs[None, :], ys[:, None], 0.0))
+
+
+def test_reachable_extent_holds_every_reachable_pose():
+    grid = np.linspace(-45, 45, 451)
+    for theta in (0.0, 0.3, -0.6):
+        mask = pose_workspace.reachable(grid[None, :], grid[:, None], theta)
+        row, col = np.nonzero(mask)
+        x0, x1, y0, y1 = pose_workspace.reachable_extent(theta)
+        assert x0 <= grid[col].min() and grid[col].max() <= x1
+        assert y0 <= grid[row].min() and grid[row].max() <= y1
@@ -0,0 +1,191 @@
+"""Monte Carlo tolerance analysis of the platform accuracy.
+
+For every nominal target the controller computes carriage setpoints with the
+nominal geometry. The real machine has a slightly different frame and link
+lengths and its movers have position error, so the platform ends up where
+the forward kinematics of the *perturbed* machine puts it. Sampling those
+perturbations many times per grid point gives the error distribution over the
+whole workspace.
+
+Both models are covered: the cable point P (``kinematics``) and the square
+platform of ``2dsim_pos.py`` (``square_kinematics``). Grid points are split
+into chunks that run in parallel worker processes; inside a chunk all
+points x samples are evaluated as one batched IK/FK pass.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import kinematics
+import pose_workspace
+import square_kinematics
+
+# Standard deviations of the perturbations (same units as the geometry)
+POINT_TOLERANCES = {
+    "B": 0.2,         # frame width
+    "H": 0.2,         # frame height
+    "l": 0.1,         # cable length, drawn per cable
+    "carriage": 0.05, # mover position error, drawn per carriage
+}
+
+SQUARE_TOLERANCES = {
+    "frame_size": 0.2,
+    "square_size": 0.05,
+    "link_length": 0.1,  # drawn per link
+    "carriage": 0.05,
+}
+
+PERCENTILES = (50, 95, 99)
+CHUNK_ELEMENTS = 2_000_000  # points x samples evaluated per task
+
+
+# === Per-sample error models ===
+def point_errors(x_P, y_P, n_samples, tolerances=POINT_TOLERANCES, rng=None,
+                 B=kinematics.B, H=kinematics.H, l=kinematics.l):
+    """Position error of P for ``n_samples`` perturbed machines per target.
+
+    Returns ``(dx, dy)``, each of shape ``(n_points, n_samples)``.
+    """
+    rng = np.random.default_rng(rng)
+    x_P = np.asarray(x_P, dtype=float).reshape(-1, 1)
+    y_P = np.asarray(y_P, dtype=float).reshape(-1, 1)
+    shape = (len(x_P), n_samples)
+
+    ys, _ = kinematics.point_ik(x_P, y_P, B, H, l)
+    ys = ys + rng.normal(0, tolerances["carriage"], shape + (4,))
+    B_real = B + rng.normal(0, tolerances["B"], shape)
+    H_real = H + rng.normal(0, tolerances["H"], shape)
+    l_real = l + rng.normal(0, tolerances["l"], shape + (4,))
+
+    P, _ = kinematics.point_fk(ys, B_real, H_real, l_real)
+    return P[..., 0] - x_P, P[..., 1] - y_P
+
+
+def square_errors(poses, n_samples, tolerances=SQUARE_TOLERANCES, rng=None,
+                  link_length=square_kinematics.LINK_LENGTH,
+                  frame_size=square_kinematics.FRAME_SIZE,
+                  square_size=square_kinematics.SQUARE_SIZE):
+    """Pose error of the square for ``n_samples`` perturbed machines per pose.
+
+    ``poses`` has shape ``(n_points, 3)``. Returns ``(dx, dy, dtheta)``, each
+    of shape ``(n_points, n_samples)``.
+    """
+    rng = np.random.default_rng(rng)
+    poses = np.asarray(poses, dtype=float).reshape(-1, 3)
+    shape = (len(poses), n_samples)
+
+    ys = square_kinematics.square_ik(poses[:, 0], poses[:, 1], poses[:, 2],
+                                     link_length, frame_size, square_size)
+    ys = ys[:, None, :] + rng.normal(0, tolerances["carriage"], shape + (4,))
+    real = square_kinematics.square_fk(
+        ys,
+        guess=np.broadcast_to(poses[:, None, :], shape + (3,)),
+        link_length=link_length + rng.normal(0, tolerances["link_length"], shape + (4,)),
+        frame_size=frame_size + rng.normal(0, tolerances["frame_size"], shape),
+        square_size=square_size + rng.normal(0, tolerances["square_size"], shape),
+    )[0]
+    error = real - poses[:, None, :]
+    return error[..., 0], error[..., 1], error[..., 2]
+
+
+def summarize(values, percentiles=PERCENTILES):
+    """Mean, std, percentiles and max along the sample axis (last axis)."""
+    stats = {
+        "mean": np.nanmean(values, axis=-1),
+        "std": np.nanstd(values, axis=-1),
+        "max": np.nanmax(values, axis=-1),
+    }
+    for p, value in zip(percentiles, np.nanpercentile(values, percentiles, axis=-1)):
+        stats[f"p{p}"] = value
+    return stats
+
+
+# === Chunk workers (module level so they can be pickled) ===
+def _point_chunk(args):
+    x_P, y_P, n_samples, tolerances, seed, geometry = args
+    dx, dy = point_errors(x_P, y_P, n_samples, tolerances, seed, **geometry)
+    return summarize(np.hypot(dx, dy))
+
+
+def _square_chunk(args):
+    poses, n_samples, tolerances, seed, geometry = args
+    dx, dy, dtheta = square_errors(poses, n_samples, tolerances, seed, **geometry)
+    return summarize(np.hypot(dx, dy)), summarize(np.abs(dtheta))
+
+
+def _run_chunks(worker, tasks, workers):
+    if workers == 1 or len(tasks) <= 1:
+        return [worker(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(worker, tasks))
+
+
+def _scatter(results, mask):
+    """Assemble per-chunk statistics into full grid maps (NaN outside ``mask``)."""
+    names = results[0] if results else summarize(np.zeros((1, 1)))  # empty workspace: all NaN
+    maps = {}
+    for name in names:
+        grid = np.full(mask.shape, np.nan)
+        if results:
+            grid[mask] = np.concatenate([r[name] for r in results])
+        maps[name] = grid
+    return maps
+
+
+def _chunks(n_points, n_samples):
+    size = max(1, CHUNK_ELEMENTS // n_samples)
+    return [(start, min(start + size, n_points)) for start in range(0, n_points, size)]
+
+
+# === Workspace analyses ===
+def point_grid_analysis(resolution=50, n_samples=10_000, tolerances=POINT_TOLERANCES,
+                        seed=0, workers=None, B=kinematics.B, H=kinematics.H,
+                        l=kinematics.l, gap=kinematics.ROLLER_GAP):
+    """Position-error statistics of P at every reachable grid point.
+
+    Returns ``(xs, ys, maps)`` where ``maps`` holds one ``(len(ys), len(xs))``
+    array per statistic (see ``summarize``).
+    """
+    xs, ys, mask = kinematics.workspace_grid(B, H, l, gap, resolution)
+    row, col = np.nonzero(mask)
+    x_P, y_P = xs[col], ys[row]
+
+    bounds = _chunks(len(x_P), n_samples)
+    seeds = np.random.SeedSequence(seed).spawn(len(bounds))
+    geometry = {"B": B, "H": H, "l": l}
+    tasks = [(x_P[a:b], y_P[a:b], n_samples, tolerances, s, geometry)
+             for (a, b), s in zip(bounds, seeds)]
+    results = _run_chunks(_point_chunk, tasks, workers or os.cpu_count())
+    return xs, ys, _scatter(results, mask)
+
+
+def square_grid_analysis(resolution=40, theta=0.0, n_samples=10_000, tolerances=SQUARE_TOLERANCES,
+                         seed=0, workers=None, link_length=square_kinematics.LINK_LENGTH,
+                         frame_size=square_kinematics.FRAME_SIZE,
+                         square_size=square_kinematics.SQUARE_SIZE):
+    """Position and angle error statistics of the square over a (cx, cy) grid at ``theta``.
+
+    The grid has ``resolution`` points per axis over the box that holds the
+    reachable poses (``pose_workspace.reachable_extent``), not the whole
+    frame: the square only reaches a narrow band of cx.
+    Returns ``(xs, ys, position_maps, angle_maps)``.
+    """
+    half = frame_size / 2
+    extent = pose_workspace.reachable_extent(theta, link_length, frame_size, square_size)
+    x0, x1, y0, y1 = (-half, half, -half, half) if extent is None else extent
+    xs = np.linspace(x0, x1, resolution)
+    ys = np.linspace(y0, y1, resolution)
+    mask = pose_workspace.reachable(xs[None, :], ys[:, None], theta, link_length, frame_size, square_size)
+
+    row, col = np.nonzero(mask)
+    poses = np.stack([xs[col], ys[row], np.full(len(row), theta)], axis=-1)
+
+    bounds = _chunks(len(poses), n_samples)
+    seeds = np.random.SeedSequence(seed).spawn(len(bounds))
+    geometry = {"link_length": link_length, "frame_size": frame_size, "square_size": square_size}
+    tasks = [(poses[a:b], n_samples, tolerances, s, geometry) for (a, b), s in zip(bounds, seeds)]
+    results = _run_chunks(_square_chunk, tasks, workers or os.cpu_count())
+    position = _scatter([r[0] for r in results], mask)
+    angle = _scatter([r[1] for r in results], mask)
+    return xs, ys, position, angle
@@ -0,0 +1,72 @@
+"""Spline paths for P and the carriage setpoints that follow them.
+
+``defined_path`` in ``2D_sim_animation`` rebuilds the spline and evaluates
+every frame just to return one of them. Here the spline is fitted once and
+evaluated for whole arrays (or chunks) of samples, together with its
+derivatives, so carriage velocities and accelerations come out exactly.
+"""
+import numpy as np
+
+from kinematics import B, H, l, point_ik, carriage_rates
+
+TOTAL_FRAMES = 500
+MARGIN = 10  # afstand van de waypoints tot de frame-rand
+
+
+def path_waypoints(x0=None, y0=None, B=B, H=H, margin=MARGIN):
+    """Waypoints of defined_path: start, upper right, origin, upper left, lower right."""
+    if x0 is None:
+        x0 = -B / 2 + margin
+    if y0 is None:
+        y0 = -H / 2 + margin
+    return np.array([
+        (x0, y0),                             # Start (under left)
+        (B / 2 - margin, H / 2 - margin),     # Upper right
+        (0, 0),                               # Origin
+        (-B / 2 + margin, H / 2 - margin),    # Upper left
+        (B / 2 - margin, -H / 2 + margin),    # Lower right
+    ])
+
+
+def fit_path(waypoints):
+    """Quadratic interpolating spline through ``waypoints`` (shape ``(n, 2)``)."""
+    from scipy.interpolate import splprep
+
+    tck, _ = splprep(np.asarray(waypoints, dtype=float).T, s=0, k=2)
+    return tck
+
+
+def evaluate_path(tck, u, der=0):
+    """Evaluate the spline (or its ``der``-th derivative) at ``u``; returns ``(x, y)``."""
+    from scipy.interpolate import splev
+
+    x, y = splev(u, tck, der=der)
+    return np.asarray(x), np.asarray(y)
+
+
+def defined_path_batch(total_frames=TOTAL_FRAMES, x0=None, y0=None, B=B, H=H):
+    """All frames of defined_path at once, as ``(x, y)`` arrays."""
+    tck = fit_path(path_waypoints(x0, y0, B, H))
+    return evaluate_path(tck, np.linspace(0, 1, total_frames))
+
+
+def iter_setpoints(n_samples, duration, tck=None, chunk_size=65536, B=B, H=H, l=l):
+    """Yield ``(t, ys, vs, accs)`` chunks of carriage setpoints along the path.
+
+    The path is traversed at constant spline-parameter rate in ``duration``
+    seconds. Only one chunk is in memory at a time, so ``n_samples`` can be
+    in the millions.
+    """
+    if tck is None:
+        tck = fit_path(path_waypoints(B=B, H=H))
+    rate = 1.0 / duration
+    for start in range(0, n_samples, chunk_size):
+        stop = min(start + chunk_size, n_samples)
+        u = np.arange(start, stop) / max(n_samples - 1, 1)
+        x, y = evaluate_path(tck, u)
+        dx, dy = evaluate_path(tck, u, der=1)
+        ddx, ddy = evaluate_path(tck, u, der=2)
+        ys, _ = point_ik(x, y, B, H, l)
+        vs, accs = carriage_rates(x, y, dx * rate, dy * rate,
+                                  ddx * rate**2, ddy * rate**2, B, H)
+        yield u * duration, ys, vs, accs
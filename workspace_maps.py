@@ -0,0 +1,237 @@
+"""Compact workspace maps: bit-packed rows with implicit coordinates.
+
+A dense boolean map plus two float meshgrids costs 17 bytes per cell; a
+``PackedMap`` costs one bit. Only the extent and the grid shape are stored,
+and cell ``(i, j)`` sits at the centre ``x0 + (j + 1/2) dx, y0 + (i + 1/2) dy``.
+Row 0 is the bottom row, as for ``imshow(..., origin='lower')``.
+
+Maps are built a block of rows at a time, so a 50k x 50k map never exists
+unpacked. Union, intersection and difference work directly on the packed
+bytes, and the area comes from a popcount. Maps are saved as a raw ``.npy``
+bit array (plus a small ``.json`` with the grid) that loads memory-mapped,
+so only the rows that are touched are read. ``to_rle``/``from_rle`` give a
+run-length form (row, start, stop) for export; smooth workspaces have one or
+two runs per row.
+"""
+import json
+
+import numpy as np
+
+import kinematics
+
+CHUNK_ELEMENTS = 4_000_000  # cells evaluated per block of rows
+
+CONSTRAINTS = kinematics.CONSTRAINTS
+
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:
+    _POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(bits):
+        return _POPCOUNT[bits]
+
+
+class PackedMap:
+    """Boolean map over ``extent = (x0, x1, y0, y1)`` on a ``shape = (ny, nx)`` grid."""
+
+    def __init__(self, bits, extent, shape):
+        self.bits = bits  # uint8, shape (ny, ceil(nx / 8)); may be a memmap
+        self.extent = tuple(float(e) for e in extent)
+        self.shape = tuple(int(n) for n in shape)
+
+    @classmethod
+    def empty(cls, extent, shape):
+        ny, nx = shape
+        return cls(np.zeros((ny, (nx + 7) // 8), dtype=np.uint8), extent, shape)
+
+    @classmethod
+    def from_predicate(cls, predicate, extent, shape, chunk_elements=CHUNK_ELEMENTS):
+        """Build the map from ``predicate(x, y) -> bool`` evaluated on blocks of rows.
+
+        ``x`` has shape ``(1, nx)`` and ``y`` shape ``(k, 1)``.
+        """
+        result = cls.empty(extent, shape)
+        xs = result.xs()
+        block = max(1, int(chunk_elements // shape[1]))
+        for start in range(0, shape[0], block):
+            stop = min(start + block, shape[0])
+            mask = predicate(xs[None, :], result.ys(start, stop)[:, None])
+            result.bits[start:stop] = np.packbits(mask, axis=-1)
+        return result
+
+    # === Implicit coordinates ===
+    @property
+    def cell(self):
+        """Cell size ``(dx, dy)``."""
+        x0, x1, y0, y1 = self.extent
+        return (x1 - x0) / self.shape[1], (y1 - y0) / self.shape[0]
+
+    def xs(self, start=0, stop=None):
+        dx = self.cell[0]
+        stop = self.shape[1] if stop is None else stop
+        return self.extent[0] + (np.arange(start, stop) + 0.5) * dx
+
+    def ys(self, start=0, stop=None):
+        dy = self.cell[1]
+        stop = self.shape[0] if stop is None else stop
+        return self.extent[2] + (np.arange(start, stop) + 0.5) * dy
+
+    def index(self, x, y):
+        """Row and column of the cells containing the points ``(x, y)``."""
+        dx, dy = self.cell
+        row = np.floor((np.asarray(y) - self.extent[2]) / dy).astype(np.intp)
+        col = np.floor((np.asarray(x) - self.extent[0]) / dx).astype(np.intp)
+        return row, col
+
+    def contains(self, x, y):
+        """Look up points without unpacking; False outside the extent."""
+        row, col = self.index(x, y)
+        inside = (row >= 0) & (row < self.shape[0]) & (col >= 0) & (col < self.shape[1])
+        row, col = np.where(inside, row, 0), np.where(inside, col, 0)
+        bit = (self.bits[row, col >> 3] >> (7 - (col & 7))) & 1
+        return inside & (bit == 1)
+
+    # === Set operations on the packed bytes ===
+    def _same_grid(self, other):
+        if self.shape != other.shape or not np.allclose(self.extent, other.extent):
+            raise ValueError("Maps are on different grids")
+
+    def __and__(self, other):
+        self._same_grid(other)
+        return PackedMap(np.bitwise_and(self.bits, other.bits), self.extent, self.shape)
+
+    def __or__(self, other):
+        self._same_grid(other)
+        return PackedMap(np.bitwise_or(self.bits, other.bits), self.extent, self.shape)
+
+    def __sub__(self, other):
+        self._same_grid(other)
+        return PackedMap(np.bitwise_and(self.bits, np.invert(other.bits)), self.extent, self.shape)
+
+    def __invert__(self):
+        bits = np.invert(self.bits)
+        spare = 8 * bits.shape[1] - self.shape[1]
+        if spare:
+            bits[:, -1] &= np.uint8((0xFF << spare) & 0xFF)  # keep the padding bits clear
+        return PackedMap(bits, self.extent, self.shape)
+
+    # === Sizes ===
+    def count(self, chunk_rows=4096):
+        """Number of set cells, counted a block of rows at a time (memmap friendly)."""
+        return sum(int(_popcount(self.bits[i:i + chunk_rows]).sum(dtype=np.int64))
+                   for i in range(0, self.shape[0], chunk_rows))
+
+    def area(self):
+        dx, dy = self.cell
+        return self.count() * dx * dy
+
+    def fraction(self):
+        return self.count() / (self.shape[0] * self.shape[1])
+
+    def nbytes(self):
+        return self.bits.nbytes
+
+    # === Dense views ===
+    def rows(self, start=0, stop=None):
+        """Unpacked boolean rows ``start:stop``."""
+        return np.unpackbits(self.bits[start:stop], axis=-1, count=self.shape[1]).astype(bool)
+
+    def to_dense(self):
+        return self.rows()
+
+    def downsample(self, factor):
+        """Coarser boolean map (any cell set per ``factor x factor`` block), for plotting."""
+        ny, nx = self.shape[0] // factor, self.shape[1] // factor
+        out = np.zeros((ny, nx), dtype=bool)
+        for i in range(ny):
+            block = self.rows(i * factor, (i + 1) * factor)[:, :nx * factor]
+            out[i] = block.reshape(factor, nx, factor).any(axis=(0, 2))
+        return out
+
+    # === Run-length form ===
+    def to_rle(self, chunk_rows=1024):
+        """Runs of set cells as ``(row, start, stop)`` int32 arrays, ``stop`` exclusive."""
+        parts = []
+        for i in range(0, self.shape[0], chunk_rows):
+            rows = self.rows(i, i + chunk_rows).astype(np.int8)
+            edges = np.diff(np.pad(rows, ((0, 0), (1, 1))), axis=1)
+            r, start = np.nonzero(edges == 1)
+            _, stop = np.nonzero(edges == -1)
+            parts.append((r + i, start, stop))
+        if not parts:
+            return tuple(np.zeros(0, dtype=np.int32) for _ in range(3))
+        return tuple(np.concatenate(p).astype(np.int32) for p in zip(*parts))
+
+    @classmethod
+    def from_rle(cls, rows, starts, stops, extent, shape, chunk_rows=1024):
+        result = cls.empty(extent, shape)
+        rows, starts, stops = (np.asarray(a, dtype=np.intp) for a in (rows, starts, stops))
+        for i in range(0, shape[0], chunk_rows):
+            k = min(chunk_rows, shape[0] - i)
+            sel = (rows >= i) & (rows < i + k)
+            delta = np.zeros((k, shape[1] + 1), dtype=np.int32)
+            np.add.at(delta, (rows[sel] - i, starts[sel]), 1)
+            np.add.at(delta, (rows[sel] - i, stops[sel]), -1)
+            result.bits[i:i + k] = np.packbits(np.cumsum(delta, axis=1)[:, :-1] > 0, axis=-1)
+        return result
+
+    # === Storage ===
+    def save(self, path):
+        """Write ``path.npy`` (packed bits) and ``path.json`` (grid)."""
+        np.save(path + ".npy", np.ascontiguousarray(self.bits))
+        with open(path + ".json", "w") as f:
+            json.dump({"extent": self.extent, "shape": self.shape}, f)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Load a saved map; with ``mmap`` the bits stay on disk until used."""
+        with open(path + ".json") as f:
+            meta = json.load(f)
+        bits = np.load(path + ".npy", mmap_mode="r" if mmap else None)
+        return cls(bits, meta["extent"], meta["shape"])
+
+
+# === Workspace maps ===
+def frame_extent(B=kinematics.B, H=kinematics.H):
+    return (-B / 2, B / 2, -H / 2, H / 2)
+
+
+def _constraint_predicate(constraint, B, H, l, gap):
+    """``predicate(x, y)`` that is True where ``constraint`` (or all, for None) holds."""
+    if constraint is not None and constraint not in CONSTRAINTS:
+        raise ValueError(f"Unknown constraint {constraint!r}")
+
+    names = CONSTRAINTS if constraint is None else (constraint,)
+
+    def predicate(x, y):
+        ok = (np.abs(x) <= B / 2) & (np.abs(y) <= H / 2)  # a common grid can exceed this frame
+        for mask in kinematics.constraint_masks(kinematics.cable_lengths(x, y, B, H), H, l, gap,
+                                                constraints=names).values():
+            ok &= mask
+        return ok
+    return predicate
+
+
+def workspace_map(B=kinematics.B, H=kinematics.H, l=kinematics.l, gap=kinematics.ROLLER_GAP,
+                  resolution=2000, constraint=None, extent=None, chunk_elements=CHUNK_ELEMENTS):
+    """Packed map of the points satisfying ``constraint`` (one of CONSTRAINTS, or all if None).
+
+    ``resolution`` is the number of cells along the longer side of ``extent``
+    (the frame by default); pass a common extent to compare geometries.
+    """
+    extent = frame_extent(B, H) if extent is None else extent
+    x0, x1, y0, y1 = extent
+    cell = max(x1 - x0, y1 - y0) / resolution
+    shape = (max(1, round((y1 - y0) / cell)), max(1, round((x1 - x0) / cell)))
+    return PackedMap.from_predicate(_constraint_predicate(constraint, B, H, l, gap), extent, shape,
+                                    chunk_elements)
+
+
+def sweep_maps(geometries, resolution=2000, gap=kinematics.ROLLER_GAP):
+    """Workspace maps for ``{name: (B, H, l)}`` on one common grid, ready for ``&``/``|``."""
+    B_max = max(g[0] for g in geometries.values())
+    H_max = max(g[1] for g in geometries.values())
+    extent = frame_extent(B_max, H_max)
+    return {name: workspace_map(B, H, l, gap, resolution, extent=extent)
+            for name, (B, H, l) in geometries.items()}